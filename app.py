@@ -22,6 +22,11 @@ from course_components.course_editor import CourseEditor
 # Load environment variables
 load_dotenv()
 
+# Folder for transcripts keyed by audio content, shared by the transcription routes (unset: no cache)
+TRANSCRIPT_CACHE_DIR = os.getenv('TRANSCRIPT_CACHE_DIR')
+# Cut large audio files into chunks at nearby pauses (one extra decoding pass per file)
+TRANSCRIPT_ALIGN_TO_SILENCE = os.getenv('TRANSCRIPT_ALIGN_TO_SILENCE', '').lower() in ('1', 'true', 'yes')
+
 app = Flask(__name__)
 CORS(app)
 
@@ -29,6 +34,9 @@ CORS(app)
 progress_queues = {}
 # Global process tracking for cancellation
 active_processes = {}
+# Shared by the quiz listing routes so parsed course.yml and chapter files stay cached
+# between requests (entries are revalidated against file mtimes)
+quiz_listing_manager = QuizWorkflowManager()
 
 def create_progress_queue():
     """Create a unique progress queue for a session"""
@@ -47,7 +55,8 @@ def send_progress(session_id, message, status="processing", percentage=None):
         }
         if percentage is not None:
             data["percentage"] = percentage
-        progress_queues[session_id].put(json.dumps(data))
+        # Serialized once by the SSE stream, which also needs the status
+        progress_queues[session_id].put(data)
 
 @app.route('/')
 def index():
@@ -170,7 +179,7 @@ def extract_transcripts():
             send_progress(session_id, f"✅ URL Type: {url_type.upper()}", "processing", 10)
             
             downloader = YouTubeDownloader()
-            transcription_service = TranscriptionService()
+            transcription_service = TranscriptionService(cache_dir=TRANSCRIPT_CACHE_DIR, align_to_silence=TRANSCRIPT_ALIGN_TO_SILENCE)
             
             # Set up output directory
             base_path = Path('outputs') / 'transcripts'
@@ -295,7 +304,7 @@ Transcribed: {time.strftime('%Y-%m-%d %H:%M:%S')}{duration_str}{timestamps_str}
                         try:
                             # Create individual instances for thread safety
                             video_downloader = YouTubeDownloader()
-                            video_transcription = TranscriptionService()
+                            video_transcription = TranscriptionService(cache_dir=TRANSCRIPT_CACHE_DIR, align_to_silence=TRANSCRIPT_ALIGN_TO_SILENCE)
 
                             # Download and transcribe
                             with stats_lock:
@@ -646,6 +655,8 @@ def create_quiz():
         difficulty = data.get('difficulty', {'easy': 3, 'intermediate': 3, 'hard': 3})
         author = data.get('author', 'Unknown Author')
         contributors_str = data.get('contributors', '')
+        # Half-price Message Batches run; results can take minutes to hours
+        use_batch_api = bool(data.get('use_batch_api', False))
         
         session_id = create_progress_queue()
         active_processes[session_id] = {'cancelled': False}
@@ -725,7 +736,8 @@ def create_quiz():
                             },
                             author=author,
                             contributors=contributors,
-                            progress_callback=quiz_progress
+                            progress_callback=quiz_progress,
+                            use_batch_api=use_batch_api
                         ):
                             if active_processes.get(session_id, {}).get('cancelled', False):
                                 send_progress(session_id, "🛑 Process cancelled", "error", 100)
@@ -851,8 +863,7 @@ def list_folders():
 def quiz_list_repos():
     """List available quiz repositories"""
     try:
-        workflow_manager = QuizWorkflowManager()
-        repositories = workflow_manager.list_repositories()
+        repositories = quiz_listing_manager.list_repositories()
         
         # Create a dictionary indexed by repo key for frontend compatibility
         repo_dict = {}
@@ -888,8 +899,7 @@ def quiz_list_courses():
         return jsonify({'error': 'repo_key parameter required'}), 400
     
     try:
-        workflow_manager = QuizWorkflowManager()
-        courses = workflow_manager.list_courses(repo_key)
+        courses = quiz_listing_manager.list_courses(repo_key)
         
         return jsonify({
             'courses': courses,
@@ -910,8 +920,7 @@ def quiz_list_chapters():
         return jsonify({'error': 'repo_key and course_name parameters required'}), 400
     
     try:
-        workflow_manager = QuizWorkflowManager()
-        chapters = workflow_manager.list_chapters(repo_key, course_name, language)
+        chapters = quiz_listing_manager.list_chapters(repo_key, course_name, language)
         
         return jsonify({
             'chapters': chapters,
@@ -933,8 +942,7 @@ def quiz_list_languages():
         return jsonify({'error': 'repo_key and course_name parameters required'}), 400
     
     try:
-        workflow_manager = QuizWorkflowManager()
-        language_codes = workflow_manager.list_languages(repo_key, course_name)
+        language_codes = quiz_listing_manager.list_languages(repo_key, course_name)
         
         # Map language codes to full names
         language_names = {
@@ -1002,6 +1010,8 @@ def quiz_generate():
     question_count = data.get('question_count', 5)
     author = data.get('author', 'Course Ally')
     contributors = data.get('contributors', [])
+    # Half-price Message Batches run; results can take minutes to hours
+    use_batch_api = bool(data.get('use_batch_api', False))
     
     # Difficulty proportions
     difficulty_proportions = data.get('difficulty_proportions', {
@@ -1046,7 +1056,9 @@ def quiz_generate():
                 difficulty_proportions=difficulty_proportions,
                 author=author,
                 contributors=contributors,
-                progress_callback=lambda msg, status, pct: send_progress(session_id, msg, status, pct)
+                use_batch_api=use_batch_api
+                # No progress_callback: every yielded update is forwarded below; intermediate
+                # updates are already throttled, while each saved question is always yielded
             ):
                 # Check if process was cancelled
                 if active_processes.get(session_id, {}).get('cancelled', False):
@@ -1056,13 +1068,13 @@ def quiz_generate():
                 # Send progress update
                 send_progress(
                     session_id,
-                    progress_update['message'],
-                    progress_update['status'],
-                    progress_update.get('percentage')
+                    progress_update.message,
+                    progress_update.status,
+                    progress_update.percentage
                 )
                 
                 # If this is the final message, break
-                if progress_update['status'] in ['success', 'error']:
+                if progress_update.status in ['success', 'error']:
                     break
                     
         except Exception as e:
@@ -1225,7 +1237,7 @@ def transcribe_local_audio():
             send_progress(session_id, f"⚡ Using {max_workers} parallel workers", "processing", 22)
             
             # Initialize transcription service
-            transcription_service = TranscriptionService()
+            transcription_service = TranscriptionService(cache_dir=TRANSCRIPT_CACHE_DIR, align_to_silence=TRANSCRIPT_ALIGN_TO_SILENCE)
             
             # Thread-safe counters
             successful = 0
@@ -1253,7 +1265,7 @@ def transcribe_local_audio():
                 
                 try:
                     # Create individual transcription service for thread safety
-                    audio_transcription = TranscriptionService()
+                    audio_transcription = TranscriptionService(cache_dir=TRANSCRIPT_CACHE_DIR, align_to_silence=TRANSCRIPT_ALIGN_TO_SILENCE)
 
                     with stats_lock:
                         ts_msg = " with timestamps" if include_timestamps else ""
@@ -1401,11 +1413,10 @@ def progress_stream(session_id):
         while True:
             try:
                 # Wait for messages with timeout
-                message = q.get(timeout=30)
-                yield f"data: {message}\n\n"
+                msg_data = q.get(timeout=30)
+                yield f"data: {json.dumps(msg_data)}\n\n"
                 
                 # Check if this was the final message
-                msg_data = json.loads(message)
                 if msg_data.get('status') in ['success', 'error']:
                     # Clean up the queue after final message
                     del progress_queues[session_id]
@@ -18,7 +18,7 @@ except ImportError:
     TranscriptionService = None
 
 from .chapter_generator import ChapterGenerator
-from .quiz_generator import QuizGenerator
+from .quiz_generator import QuizGenerator, QuizGenError
 from .quiz_workflow import QuizWorkflowManager
 from .utils import detect_youtube_url_type
 
@@ -27,6 +27,7 @@ __all__ = [
     'TranscriptionService', 
     'ChapterGenerator',
     'QuizGenerator',
+    'QuizGenError',
     'QuizWorkflowManager',
     'detect_youtube_url_type'
 ]
\ No newline at end of file
@@ -372,8 +372,8 @@ Chapter content:
         """Extract source information from transcript content."""
         source_info = {'transcript_file': file_path.name}
         
-        lines = content.split('\n')
-        for line in lines[:10]:  # Check first 10 lines for metadata
+        # Check first 10 lines for metadata, without splitting the rest of the transcript
+        for line in content.split('\n', 10)[:10]:
             if 'Video ID:' in line:
                 source_info['video_id'] = line.split('Video ID:')[1].strip()
             elif 'URL:' in line and 'youtube.com' in line:
@@ -383,17 +383,14 @@ Chapter content:
     
     def _clean_transcript_content(self, content: str) -> str:
         """Remove metadata header from transcript content."""
-        lines = content.split('\n')
-        
         # Find the end of metadata section (usually marked by === line)
-        content_start = 0
-        for i, line in enumerate(lines):
-            if '=' * 10 in line:  # Look for separator line
-                content_start = i + 1
-                break
+        separator = content.find('=' * 10)
+        if separator == -1:
+            return content.strip()
         
-        # Join remaining lines
-        return '\n'.join(lines[content_start:]).strip()
+        # Content starts on the line after the separator
+        line_end = content.find('\n', separator)
+        return content[line_end + 1:].strip() if line_end != -1 else ''
     
     def get_client_info(self) -> Dict[str, Any]:
         """Get information about the underlying API client."""
@@ -1,6 +1,7 @@
 import click
 import tempfile
 import json
+import os
 import time
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -13,6 +14,15 @@ from course_components.chapter_generator import ChapterGenerator
 from course_components.quiz_generator import QuizGenerator
 from course_components.utils import detect_youtube_url_type
 
+# Audio extensions counted in the subfolder overview, and the ones picked up for transcription
+AUDIO_COUNT_SUFFIXES = ('.mp3', '.wav', '.m4a', '.ogg', '.flac')
+AUDIO_SUFFIXES = AUDIO_COUNT_SUFFIXES + ('.MP3', '.WAV', '.M4A')
+
+def _files_with_suffixes(folder: Path, suffixes: tuple) -> list:
+    """Files in folder whose name ends with one of suffixes, read in a single directory scan."""
+    with os.scandir(folder) as entries:
+        return [Path(entry.path) for entry in entries if entry.name.endswith(suffixes) and entry.is_file()]
+
 @click.group()
 def cli() -> None:
     """
@@ -34,7 +44,11 @@ def cli() -> None:
               help='Maximum number of parallel workers for transcription.')
 @click.option('--timestamps', '-t', is_flag=True, default=False,
               help='Include timestamps in the transcript (sentence-level).')
-def extract_playlist_transcripts(youtube_url: str, output_dir: str, subfolder: str, format: str, max_workers: int, timestamps: bool) -> None:
+@click.option('--cache-dir', type=click.Path(file_okay=False), envvar='TRANSCRIPT_CACHE_DIR', default=None,
+              help='Reuse transcripts of unchanged audio from this folder (env: TRANSCRIPT_CACHE_DIR).')
+@click.option('--align-to-silence', is_flag=True, envvar='TRANSCRIPT_ALIGN_TO_SILENCE', default=False,
+              help='Cut large files into chunks at nearby pauses (env: TRANSCRIPT_ALIGN_TO_SILENCE).')
+def extract_playlist_transcripts(youtube_url: str, output_dir: str, subfolder: str, format: str, max_workers: int, timestamps: bool, cache_dir: str, align_to_silence: bool) -> None:
     """
     Extract transcripts from YouTube content (auto-detects videos vs playlists).
 
@@ -56,7 +70,7 @@ def extract_playlist_transcripts(youtube_url: str, output_dir: str, subfolder: s
     click.echo(f'🔍 URL Type Detected: {url_type.upper()}')
     
     downloader = YouTubeDownloader()
-    transcription_service = TranscriptionService()
+    transcription_service = TranscriptionService(cache_dir=cache_dir, align_to_silence=align_to_silence)
     
     # Use outputs/transcripts as base directory
     base_path = Path('outputs') / 'transcripts'
@@ -240,7 +254,7 @@ Words: {word_count} | Sentences: {sentence_count}{duration_str}{timestamps_str}
         
         # Create individual instances for thread safety
         video_downloader = YouTubeDownloader()
-        video_transcription_service = TranscriptionService()
+        video_transcription_service = TranscriptionService(cache_dir=cache_dir, align_to_silence=align_to_silence)
         
         # Progress callback for individual video processing
         def video_progress(message):
@@ -437,7 +451,11 @@ Words: {word_count} | Characters: {char_count}{duration_str}{timestamps_str}
               help='Maximum number of parallel workers for transcription.')
 @click.option('--timestamps', '-t', is_flag=True, default=False,
               help='Include timestamps in the transcript (sentence-level).')
-def transcribe_local_audio(output_dir: str, subfolder: str, format: str, max_workers: int, timestamps: bool) -> None:
+@click.option('--cache-dir', type=click.Path(file_okay=False), envvar='TRANSCRIPT_CACHE_DIR', default=None,
+              help='Reuse transcripts of unchanged audio from this folder (env: TRANSCRIPT_CACHE_DIR).')
+@click.option('--align-to-silence', is_flag=True, envvar='TRANSCRIPT_ALIGN_TO_SILENCE', default=False,
+              help='Cut large files into chunks at nearby pauses (env: TRANSCRIPT_ALIGN_TO_SILENCE).')
+def transcribe_local_audio(output_dir: str, subfolder: str, format: str, max_workers: int, timestamps: bool, cache_dir: str, align_to_silence: bool) -> None:
     """
     Transcribe local audio files from outputs/audios directory.
     
@@ -464,9 +482,7 @@ def transcribe_local_audio(output_dir: str, subfolder: str, format: str, max_wor
     click.echo("📁 Available audio subfolders:")
     for idx, folder in enumerate(subfolders, 1):
         # Count audio files (common formats)
-        audio_files = list(folder.glob('*.mp3')) + list(folder.glob('*.wav')) + \
-                     list(folder.glob('*.m4a')) + list(folder.glob('*.ogg')) + \
-                     list(folder.glob('*.flac'))
+        audio_files = _files_with_suffixes(folder, AUDIO_COUNT_SUFFIXES)
         click.echo(f"  {idx}. {folder.name} ({len(audio_files)} audio files)")
     
     # Get user selection for subfolder
@@ -484,11 +500,7 @@ def transcribe_local_audio(output_dir: str, subfolder: str, format: str, max_wor
             click.echo("❌ Please enter a valid number")
     
     # Get all audio files in selected folder (sorted alphabetically)
-    audio_extensions = ['*.mp3', '*.wav', '*.m4a', '*.ogg', '*.flac', '*.MP3', '*.WAV', '*.M4A']
-    all_audio_files = []
-    for ext in audio_extensions:
-        all_audio_files.extend(selected_folder.glob(ext))
-    all_audio_files = sorted(all_audio_files, key=lambda x: x.name.lower())
+    all_audio_files = sorted(_files_with_suffixes(selected_folder, AUDIO_SUFFIXES), key=lambda x: x.name.lower())
     
     if not all_audio_files:
         click.echo(f"❌ No audio files found in {selected_folder.name}")
@@ -559,7 +571,7 @@ def transcribe_local_audio(output_dir: str, subfolder: str, format: str, max_wor
     click.echo('─' * 60)
     
     # Initialize transcription service
-    transcription_service = TranscriptionService()
+    transcription_service = TranscriptionService(cache_dir=cache_dir, align_to_silence=align_to_silence)
     click.echo('✅ Transcription service initialized')
     
     transcripts_data = []
@@ -588,7 +600,7 @@ def transcribe_local_audio(output_dir: str, subfolder: str, format: str, max_wor
         file_start_time = time.time()
         
         # Create individual transcription service for thread safety
-        audio_transcription_service = TranscriptionService()
+        audio_transcription_service = TranscriptionService(cache_dir=cache_dir, align_to_silence=align_to_silence)
         
         # Progress callback
         def audio_progress(message):
@@ -1,63 +1,307 @@
 import yaml
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import uuid
-from datetime import datetime
+from dataclasses import dataclass, field
+from functools import lru_cache
+from datetime import date
 import anthropic
 import os
+import stat
+import tempfile
+import threading
+import time
 from dotenv import load_dotenv
 import re
 
+try:
+    # libyaml-backed loader is much faster when PyYAML was built with it
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 load_dotenv()
 
+
+class QuizGenError(Exception):
+    """Raised when a quiz cannot be generated from a chapter."""
+    __slots__ = ()
+
+
+class _LiteralStr(str):
+    """String rendered in YAML literal block style."""
+
+
+class _QuizYamlDumper(yaml.SafeDumper):
+    """SafeDumper that indents list items under their key, like the quiz files in the course repos."""
+
+    def increase_indent(self, flow=False, indentless=False):
+        return super().increase_indent(flow, False)
+
+
+_QuizYamlDumper.add_representer(
+    _LiteralStr,
+    lambda dumper, data: dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
+)
+
+
+# Process umask, read once: os.umask can only be queried by setting it
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def _write_text_atomic(path: str, text: str) -> None:
+    """Write a file via a temp file in the same folder and os.replace, so readers never see a partial file"""
+    directory, name = os.path.split(path)
+    # Unique temp name, so concurrent writers of the same path never share a temp file
+    tmp_file = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory or '.',
+                                           prefix=f'.{name}.', suffix='.tmp', delete=False)
+    try:
+        with tmp_file:
+            tmp_file.write(text)
+        # Temp files are created 0600; give the result the mode a plain open() would,
+        # or keep the mode of the file being replaced
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_file.name, mode)
+        os.replace(tmp_file.name, path)
+    except BaseException:
+        # Don't leave the temp file behind in the course repository
+        os.unlink(tmp_file.name)
+        raise
+
+
+class _AdaptiveRateLimiter:
+    """
+    Spaces out Claude requests across threads.
+    
+    Starts unthrottled, widens the gap between requests after each rate-limit
+    response and narrows it again as requests succeed.
+    """
+    
+    def __init__(self, max_interval: float = 30.0):
+        self._lock = threading.Lock()
+        self._interval = 0.0
+        self._next_slot = 0.0
+        self.max_interval = max_interval
+    
+    def acquire(self) -> None:
+        """Block until the caller may send its request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+    
+    def on_success(self) -> None:
+        with self._lock:
+            self._interval = 0.0 if self._interval < 0.1 else self._interval * 0.7
+    
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self._interval = min(max(self._interval / 0.7, 1.0), self.max_interval)
+            self._next_slot = max(self._next_slot, time.monotonic() + (retry_after or self._interval))
+
+
+# Rate limits apply per API key, so every generator in the process shares one limiter
+_claude_rate_limiter = _AdaptiveRateLimiter()
+
+
+@lru_cache(maxsize=1)
+def _shared_client(api_key: Optional[str]) -> anthropic.Anthropic:
+    """Anthropic client shared by every QuizGenerator using this API key, so they reuse one connection pool."""
+    return anthropic.Anthropic(
+        api_key=api_key,
+        max_retries=QuizGenerator.CLAUDE_MAX_RETRIES
+    )
+
+
+@dataclass
+class QuestionMeta:
+    """Metadata stored in a quiz's question.yml."""
+    id: str
+    chapterId: Optional[str]
+    difficulty: str
+    duration: int
+    author: str
+    original_language: str
+    proofreading: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_quiz_data(cls, quiz_data: Dict[str, Any], contribution_date: str, contributor_names: List[str]) -> 'QuestionMeta':
+        """Build the metadata from a generated quiz dictionary."""
+        return cls(
+            id=quiz_data['id'],
+            chapterId=quiz_data['chapterId'],
+            difficulty=quiz_data['difficulty'],
+            duration=quiz_data['duration'],
+            author=quiz_data['author'],
+            original_language=quiz_data['original_language'],
+            proofreading=[
+                {
+                    'language': 'en',
+                    'last_contribution_date': contribution_date,
+                    'urgency': 1,
+                    'contributor_names': contributor_names or [],
+                    'reward': 1
+                }
+            ]
+        )
+
+    def to_yaml(self) -> str:
+        """Render as YAML, keeping dates unquoted."""
+        lines = [
+            f"id: {self.id}",
+            f"chapterId: {self.chapterId}",
+            f"difficulty: {self.difficulty}",
+            f"duration: {self.duration}",
+            f"author: {self.author}",
+            f"original_language: {self.original_language}",
+            "proofreading:",
+        ]
+        for proof in self.proofreading:
+            lines.append(f"  - language: {proof['language']}")
+            lines.append(f"    last_contribution_date: {proof['last_contribution_date']}")
+            lines.append(f"    urgency: {proof['urgency']}")
+            lines.append("    contributor_names:")
+            if proof['contributor_names']:
+                lines.extend(f"      - {contributor}" for contributor in proof['contributor_names'])
+            else:
+                lines.append("      []")
+            lines.append(f"    reward: {proof['reward']}")
+        return '\n'.join(lines) + '\n'
+
+
+@dataclass
+class EnContent:
+    """Question content stored in a quiz's en.yml."""
+    # Explicit slots rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('question', 'answer', 'wrong_answers', 'explanation')
+
+    question: str
+    answer: str
+    wrong_answers: List[str]
+    explanation: str
+
+    @classmethod
+    def from_quiz_data(cls, quiz_data: Dict[str, Any]) -> 'EnContent':
+        """Build the content from a generated quiz dictionary."""
+        return cls(
+            question=quiz_data['question'],
+            answer=quiz_data['answer'],
+            wrong_answers=quiz_data['wrong_answers'],
+            explanation=quiz_data['explanation']
+        )
+
+    def to_yaml(self) -> str:
+        """Render as YAML in the order: question, answer, wrong_answers, explanation."""
+        # Explanation - use literal style for multi-line or long text
+        explanation = self.explanation
+        if '\n' in explanation or len(explanation) > 80:
+            explanation = _LiteralStr(explanation if explanation.endswith('\n') else explanation + '\n')
+
+        document = {
+            'question': self.question,
+            'answer': self.answer,
+            'wrong_answers': list(self.wrong_answers),
+            'explanation': explanation,
+        }
+        # Let the YAML emitter decide quoting/escaping instead of guessing from quote characters
+        return yaml.dump(
+            document,
+            Dumper=_QuizYamlDumper,
+            allow_unicode=True,
+            sort_keys=False,
+            default_flow_style=False,
+            width=float('inf')  # Keep question and answers on a single line
+        )
+
+
 class QuizGenerator:
     """Generator for creating quiz questions from chapter content using Claude."""
     
-    def __init__(self, language: str = "en"):
+    LANGUAGE_NAMES = {
+        "en": "English",
+        "fr": "French",
+        "es": "Spanish",
+        "de": "German",
+        "it": "Italian",
+        "pt": "Portuguese",
+        "ru": "Russian",
+        "ja": "Japanese",
+        "ko": "Korean",
+        "zh-Hans": "Simplified Chinese",
+        "zh-Hant": "Traditional Chinese",
+        "ar": "Arabic",
+        "hi": "Hindi",
+        "cs": "Czech",
+        "nl": "Dutch",
+        "pl": "Polish",
+        "tr": "Turkish",
+        "vi": "Vietnamese",
+        "id": "Indonesian",
+        "fi": "Finnish",
+        "sv": "Swedish",
+        "nb-NO": "Norwegian",
+        "et": "Estonian",
+        "fa": "Persian",
+        "rn": "Kirundi",
+        "si": "Sinhala",
+        "sw": "Swahili",
+        "sr-Latn": "Serbian (Latin)",
+    }
+    
+    # Question duration in seconds per difficulty
+    DIFFICULTY_DURATIONS = {
+        'easy': 15,
+        'intermediate': 30,
+        'hard': 45
+    }
+    
+    # Claude request settings shared by the direct and batch paths
+    CLAUDE_MODEL = "claude-sonnet-4-20250514"
+    CLAUDE_MAX_TOKENS = 20000
+    CLAUDE_TEMPERATURE = 0.7
+    # Retries on timeouts, 429 and 5xx: by the SDK for batch calls, and by _create_message
+    # (paced by the shared limiter, with SDK retries off) for direct requests
+    CLAUDE_MAX_RETRIES = 5
+    # Status codes worth retrying, the same ones the SDK retries
+    RETRYABLE_STATUS_CODES = (408, 409, 429)
+    # Context window of CLAUDE_MODEL and room kept for the instructions and existing questions
+    CLAUDE_CONTEXT_TOKENS = 200000
+    PROMPT_OVERHEAD_TOKENS = 4000
+    # Account or configuration errors that every following request would hit as well
+    FATAL_API_ERRORS = (anthropic.AuthenticationError, anthropic.PermissionDeniedError, anthropic.NotFoundError)
+    
+    _CHAPTER_ID_TAG_RE = re.compile(r'<chapterId>\s*([^<]+?)\s*</chapterId>')
+    _CHAPTER_ID_FIELD_RE = re.compile(r'^chapterId:\s*(.+)$', re.MULTILINE)
+    _DIFFICULTY_FIELD_RE = re.compile(r'^difficulty:\s*(.+)$', re.MULTILINE)
+    _QUESTION_FIELD_RE = re.compile(r'^question:\s*(.+)$', re.MULTILINE)
+    _JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+    
+    def __init__(self, language: str = "en", client: Optional[anthropic.Anthropic] = None):
         """Initialize the quiz generator with Claude API.
         
         Args:
             language: Language code for quiz generation (e.g., 'en', 'fr', 'es').
+            client: Anthropic client to use instead of the process-wide shared one.
         """
-        self.client = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.client = client or _shared_client(os.getenv('ANTHROPIC_API_KEY'))
+        # Direct requests are retried by _create_message, which lets the shared limiter see
+        # every 429; SDK retries on top would multiply the attempts per question
+        self._message_client = self.client.with_options(max_retries=0)
         self.author = None
         self.contributor_names = []
         self.language = language
 
     def _get_language_name(self, code: str) -> str:
         """Convert language code to full language name."""
-        language_map = {
-            "en": "English",
-            "fr": "French",
-            "es": "Spanish",
-            "de": "German",
-            "it": "Italian",
-            "pt": "Portuguese",
-            "ru": "Russian",
-            "ja": "Japanese",
-            "ko": "Korean",
-            "zh-Hans": "Simplified Chinese",
-            "zh-Hant": "Traditional Chinese",
-            "ar": "Arabic",
-            "hi": "Hindi",
-            "cs": "Czech",
-            "nl": "Dutch",
-            "pl": "Polish",
-            "tr": "Turkish",
-            "vi": "Vietnamese",
-            "id": "Indonesian",
-            "fi": "Finnish",
-            "sv": "Swedish",
-            "nb-NO": "Norwegian",
-            "et": "Estonian",
-            "fa": "Persian",
-            "rn": "Kirundi",
-            "si": "Sinhala",
-            "sw": "Swahili",
-            "sr-Latn": "Serbian (Latin)",
-        }
-        return language_map.get(code, code)
+        return self.LANGUAGE_NAMES.get(code, code)
     
     def collect_metadata(self) -> None:
         """Collect author and contributor information interactively."""
@@ -103,8 +347,8 @@ class QuizGenerator:
         # Read chapter content
         try:
             chapter_content = chapter_file.read_text(encoding='utf-8')
-        except Exception as e:
-            raise Exception(f"Error reading chapter file: {e}")
+        except (OSError, UnicodeDecodeError) as e:
+            raise QuizGenError(f"Error reading chapter file: {chapter_file}") from e
         
         # Extract chapter ID from content using <chapterId> tag
         if not chapter_id:
@@ -123,7 +367,8 @@ class QuizGenerator:
                             chapter_file,
                             quizz_output_path,
                             difficulty,
-                            chapter_id
+                            chapter_id,
+                            chapter_content=chapter_content
                         )
                     else:
                         # Fallback to old method if no output path provided
@@ -153,7 +398,7 @@ class QuizGenerator:
         
         return all_quizzes
 
-    def generate_quiz_incrementally(self, chapter_file: Path, quizz_output_path: Path, difficulty: str, chapter_id: Optional[str] = None) -> Dict[str, Any]:
+    def generate_quiz_incrementally(self, chapter_file: Path, quizz_output_path: Path, difficulty: str, chapter_id: Optional[str] = None, chapter_content: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate a single quiz question incrementally, checking for existing questions to avoid duplicates.
         
@@ -162,15 +407,17 @@ class QuizGenerator:
             quizz_output_path: Path to the quizz directory where questions are saved
             difficulty: Difficulty level ('easy', 'intermediate', 'hard')
             chapter_id: Optional chapter ID to associate with the quiz
+            chapter_content: Optional already-read chapter content, avoids re-reading the file
             
         Returns:
             Dictionary containing the generated quiz data
         """
-        # Read chapter content
-        try:
-            chapter_content = chapter_file.read_text(encoding='utf-8')
-        except Exception as e:
-            raise Exception(f"Error reading chapter file: {e}")
+        # Read chapter content unless the caller already did
+        if chapter_content is None:
+            try:
+                chapter_content = chapter_file.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError) as e:
+                raise QuizGenError(f"Error reading chapter file: {chapter_file}") from e
         
         # Extract chapter ID from content using <chapterId> tag
         if not chapter_id:
@@ -203,22 +450,18 @@ class QuizGenerator:
         
         # Save the quiz immediately
         self.save_quiz_files(quiz_data, quizz_output_path, quiz_number_str)
+        print(f"✅ Quiz files saved to {quizz_output_path / quiz_number_str}")
         
         return quiz_data
     
     def _get_duration_for_difficulty(self, difficulty: str) -> int:
         """Get duration in seconds based on difficulty."""
-        durations = {
-            'easy': 15,
-            'intermediate': 30,
-            'hard': 45
-        }
-        return durations.get(difficulty, 30)
+        return self.DIFFICULTY_DURATIONS.get(difficulty, 30)
     
     def _extract_chapter_id(self, content: str) -> Optional[str]:
         """Extract chapter ID from chapter content using <chapterId> tag."""
         # Look for <chapterId>...</chapterId> pattern
-        match = re.search(r'<chapterId>\s*([^<]+?)\s*</chapterId>', content)
+        match = self._CHAPTER_ID_TAG_RE.search(content)
         if match:
             return match.group(1).strip()
         return None
@@ -255,8 +498,8 @@ class QuizGenerator:
                     content = f.read()
                     
                 # Extract chapterId and difficulty
-                chapter_match = re.search(r'^chapterId:\s*(.+)$', content, re.MULTILINE)
-                difficulty_match = re.search(r'^difficulty:\s*(.+)$', content, re.MULTILINE)
+                chapter_match = self._CHAPTER_ID_FIELD_RE.search(content)
+                difficulty_match = self._DIFFICULTY_FIELD_RE.search(content)
                 
                 if not chapter_match or chapter_match.group(1).strip() != chapter_id:
                     continue
@@ -275,9 +518,16 @@ class QuizGenerator:
                     lang_content = f.read()
                     
                 # Extract question text
-                question_match = re.search(r'^question:\s*(.+)$', lang_content, re.MULTILINE)
+                question_match = self._QUESTION_FIELD_RE.search(lang_content)
                 if question_match:
                     question_text = question_match.group(1).strip()
+                    if question_text[:1] in ('"', "'"):
+                        # Quoted YAML scalar (written by yaml.dump) - unquote it. Older files
+                        # stored the raw text, which can merely start with a quote
+                        try:
+                            question_text = yaml.load(question_text, Loader=YamlSafeLoader)
+                        except yaml.YAMLError:
+                            pass
                     existing_questions.append({
                         'question': question_text,
                         'difficulty': difficulty
@@ -289,112 +539,8 @@ class QuizGenerator:
                 
         return existing_questions
     
-    def _generate_quiz_with_claude(self, chapter_content: str, chapter_name: str, difficulty: str, question_number: int) -> Dict[str, Any]:
-        """Generate quiz questions using Claude."""
-        
-        language_name = self._get_language_name(self.language)
-        
-        difficulty_instructions = {
-            'easy': """
-- Focus on basic concepts and definitions
-- Test recall of fundamental information
-- Use straightforward language
-- Target key terms and simple relationships""",
-            'intermediate': """
-- Test understanding of relationships between concepts
-- Require application of knowledge to scenarios
-- Focus on processes and procedures
-- Test comprehension beyond basic recall""",
-            'hard': """
-- Test analysis and synthesis of complex concepts
-- Require critical thinking and evaluation
-- Focus on edge cases and nuanced understanding
-- Test ability to apply knowledge to novel situations"""
-        }
-        
-        prompt = f"""Based on the following chapter content, create a {difficulty} multiple-choice quiz question #{question_number}.
-
-IMPORTANT: Generate the question, all answers, and explanation in {language_name}. The entire quiz content MUST be in {language_name}.
-
-Chapter: {chapter_name}
-
-Content:
-{chapter_content}
-
-Requirements for {difficulty} difficulty:
-{difficulty_instructions[difficulty]}
-
-Generate a quiz question with:
-1. A clear, single-line question (no line breaks) - in {language_name}
-2. One correct answer (single line) - in {language_name}
-3. Three wrong answers that are plausible but clearly incorrect (each on single line) - in {language_name}
-4. A 50-word explanation that provide argument why it's true, or reformulate the concept to ease the understanding - in {language_name}
-
-IMPORTANT:
-- ALL content must be in {language_name}
-- Keep question and answers on single lines (no line breaks within them)
-- Wrong answers should be believable but definitively incorrect
-- Correct and wrong answer should be roughly the same length
-- Explanation should thoroughly explain why the correct answer is right and others are wrong
-- For the chapter content provided, focus on key concepts that appear in the material
-- The question should be self-sufficient and MUST NOT have reference to the chapter itself, like "seen in the current chapter"
-
-Return ONLY a JSON object in this exact format:
-{{
-    "question": "Your single-line question here in {language_name}?",
-    "answer": "The correct answer in {language_name}",
-    "wrong_answers": [
-        "First wrong answer in {language_name}",
-        "Second wrong answer in {language_name}",
-        "Third wrong answer in {language_name}"
-    ],
-    "explanation": "Detailed explanation in {language_name}. Can be multiple sentences and paragraphs."
-}}
-"""
-        
-        try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=20000,
-                temperature=0.7,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            # Extract JSON from response
-            response_text = response.content[0].text
-            
-            # Try to find JSON in the response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                quiz_data = json.loads(json_match.group())
-                
-                # Clean up any line breaks in question and answers
-                quiz_data['question'] = ' '.join(quiz_data['question'].split())
-                quiz_data['answer'] = ' '.join(quiz_data['answer'].split())
-                quiz_data['wrong_answers'] = [' '.join(ans.split()) for ans in quiz_data['wrong_answers']]
-                
-                return quiz_data
-            else:
-                raise ValueError("No valid JSON found in response")
-                
-        except Exception as e:
-            print(f"⚠️  Error generating quiz: {e}")
-            # Return a fallback quiz
-            return {
-                "question": f"What is a key concept from {chapter_name}?",
-                "answer": "The main concept discussed in the chapter",
-                "wrong_answers": [
-                    "An unrelated concept",
-                    "A different topic",
-                    "An incorrect statement"
-                ],
-                "explanation": "This is a placeholder question. The actual content should be based on the chapter material."
-            }
-
-    def _generate_quiz_with_claude_avoiding_duplicates(self, chapter_content: str, chapter_name: str, difficulty: str, existing_questions: List[Dict[str, str]]) -> Dict[str, Any]:
-        """Generate quiz questions using Claude while avoiding duplicates."""
+    def _build_quiz_prompt(self, chapter_content: str, chapter_name: str, difficulty: str, existing_questions: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Build the user message content blocks for one quiz question that avoids the existing ones."""
         
         language_name = self._get_language_name(self.language)
         
@@ -432,14 +578,17 @@ Return ONLY a JSON object in this exact format:
                 for i, question in enumerate(questions, 1):
                     existing_questions_text += f"  {i}. {question}\n"
         
-        prompt = f"""Based on the following chapter content, create a {difficulty} multiple-choice quiz question.
-
-IMPORTANT: Generate the question, all answers, and explanation in {language_name}. The entire quiz content MUST be in {language_name}.
-
-Chapter: {chapter_name}
+        # The chapter goes first in its own cached block: every question of a chapter
+        # shares this exact prefix, so only the first request pays for its input tokens
+        chapter_block = f"""Chapter: {chapter_name}
 
 Content:
 {chapter_content}
+"""
+        
+        instructions = f"""Based on the chapter content above, create a {difficulty} multiple-choice quiz question.
+
+IMPORTANT: Generate the question, all answers, and explanation in {language_name}. The entire quiz content MUST be in {language_name}.
 
 Requirements for {difficulty} difficulty:
 {difficulty_instructions[difficulty]}
@@ -474,49 +623,160 @@ Return ONLY a JSON object in this exact format:
     "explanation": "Detailed explanation in {language_name}. Can be multiple sentences and paragraphs."
 }}
 """
+        return [
+            {"type": "text", "text": chapter_block, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": instructions}
+        ]
+    
+    def chapter_fits_context(self, chapter_content: str) -> bool:
+        """Cheap check that a chapter leaves room for the instructions and the answer.
+        
+        Estimates 3 UTF-8 bytes per token. English averages closer to 4, so the
+        estimate runs high and errs toward rejecting: an English chapter near the
+        limit may be skipped even though it would have fit. Text that packs more
+        tokens into fewer bytes can slip through, and then fails at the API instead.
+        """
+        estimated_tokens = len(chapter_content.encode('utf-8')) // 3
+        return estimated_tokens + self.PROMPT_OVERHEAD_TOKENS + self.CLAUDE_MAX_TOKENS <= self.CLAUDE_CONTEXT_TOKENS
+    
+    def _parse_quiz_response(self, response_text: str) -> Dict[str, Any]:
+        """Extract the quiz JSON from a Claude response and normalize its single-line fields."""
+        # Try to find JSON in the response
+        json_match = self._JSON_OBJECT_RE.search(response_text)
+        if not json_match:
+            raise ValueError("No valid JSON found in response")
+        
+        quiz_data = json.loads(json_match.group())
+        
+        # Clean up any line breaks in question and answers
+        quiz_data['question'] = ' '.join(quiz_data['question'].split())
+        quiz_data['answer'] = ' '.join(quiz_data['answer'].split())
+        quiz_data['wrong_answers'] = [' '.join(ans.split()) for ans in quiz_data['wrong_answers']]
+        
+        return quiz_data
+    
+    def _fallback_quiz(self, chapter_name: str) -> Dict[str, Any]:
+        """Placeholder quiz used when Claude's answer cannot be used."""
+        return {
+            "question": f"What is a key concept from {chapter_name}?",
+            "answer": "The main concept discussed in the chapter",
+            "wrong_answers": [
+                "An unrelated concept",
+                "A different topic",
+                "An incorrect statement"
+            ],
+            "explanation": "This is a placeholder question. The actual content should be based on the chapter material."
+        }
+    
+    def _generate_quiz_with_claude_avoiding_duplicates(self, chapter_content: str, chapter_name: str, difficulty: str, existing_questions: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Generate quiz questions using Claude while avoiding duplicates."""
+        prompt = self._build_quiz_prompt(chapter_content, chapter_name, difficulty, existing_questions)
         
         try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=20000,
-                temperature=0.7,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            # Extract JSON from response
-            response_text = response.content[0].text
-            
-            # Try to find JSON in the response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                quiz_data = json.loads(json_match.group())
-                
-                # Clean up any line breaks in question and answers
-                quiz_data['question'] = ' '.join(quiz_data['question'].split())
-                quiz_data['answer'] = ' '.join(quiz_data['answer'].split())
-                quiz_data['wrong_answers'] = [' '.join(ans.split()) for ans in quiz_data['wrong_answers']]
-                
-                return quiz_data
-            else:
-                raise ValueError("No valid JSON found in response")
-                
+            response = self._create_message(prompt)
+            return self._parse_quiz_response(response.content[0].text)
+        except (anthropic.RateLimitError, *self.FATAL_API_ERRORS):
+            # Let the caller skip this slot (or stop the run) rather than saving a placeholder question
+            raise
         except Exception as e:
             print(f"⚠️  Error generating quiz: {e}")
             # Return a fallback quiz
-            return {
-                "question": f"What is a key concept from {chapter_name}?",
-                "answer": "The main concept discussed in the chapter",
-                "wrong_answers": [
-                    "An unrelated concept",
-                    "A different topic",
-                    "An incorrect statement"
-                ],
-                "explanation": "This is a placeholder question. The actual content should be based on the chapter material."
+            return self._fallback_quiz(chapter_name)
+    
+    def _create_message(self, prompt: List[Dict[str, Any]]):
+        """Send one prompt to Claude through the shared rate limiter."""
+        for attempt in range(self.CLAUDE_MAX_RETRIES + 1):
+            _claude_rate_limiter.acquire()
+            try:
+                response = self._message_client.messages.create(
+                    model=self.CLAUDE_MODEL,
+                    max_tokens=self.CLAUDE_MAX_TOKENS,
+                    temperature=self.CLAUDE_TEMPERATURE,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+            except (anthropic.APIStatusError, anthropic.APIConnectionError) as e:
+                # Connection errors and timeouts carry no status code and are always retried
+                status = getattr(e, 'status_code', None)
+                retryable = status is None or status in self.RETRYABLE_STATUS_CODES or status >= 500
+                if not retryable or attempt == self.CLAUDE_MAX_RETRIES:
+                    raise
+                retry_after = e.response.headers.get('retry-after') if status is not None else None
+                try:
+                    retry_after = float(retry_after) if retry_after else None
+                except ValueError:
+                    retry_after = None
+                _claude_rate_limiter.on_rate_limited(retry_after)
+                continue
+            _claude_rate_limiter.on_success()
+            return response
+    
+    def submit_quiz_batch(self, jobs: List[Dict[str, Any]]) -> str:
+        """
+        Submit many quiz questions as one Message Batches request (half the token cost,
+        results typically within minutes but up to 24 hours).
+        
+        Args:
+            jobs: Dicts with chapter_content, chapter_name, difficulty and existing_questions
+            
+        Returns:
+            The batch ID; result custom_ids are the job indexes as strings
+        """
+        requests = [
+            {
+                "custom_id": str(index),
+                "params": {
+                    "model": self.CLAUDE_MODEL,
+                    "max_tokens": self.CLAUDE_MAX_TOKENS,
+                    "temperature": self.CLAUDE_TEMPERATURE,
+                    "messages": [
+                        {"role": "user", "content": self._build_quiz_prompt(
+                            job['chapter_content'],
+                            job['chapter_name'],
+                            job['difficulty'],
+                            job['existing_questions']
+                        )}
+                    ]
+                }
             }
+            for index, job in enumerate(jobs)
+        ]
+        batch = self.client.messages.batches.create(requests=requests)
+        return batch.id
+    
+    def wait_for_quiz_batch(self, batch_id: str, poll_interval: float = 10.0, max_poll_interval: float = 120.0) -> Iterator[Any]:
+        """
+        Poll a batch until it has ended, backing off exponentially between polls.
+        
+        Yields:
+            The batch object after each poll (request_counts shows progress)
+        """
+        while True:
+            batch = self.client.messages.batches.retrieve(batch_id)
+            yield batch
+            if batch.processing_status == 'ended':
+                return
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 1.5, max_poll_interval)
+    
+    def iter_quiz_batch_results(self, batch_id: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        """
+        Stream the results of an ended batch.
+        
+        Yields:
+            (job index, quiz data) tuples; quiz data is None when that request failed
+        """
+        for entry in self.client.messages.batches.results(batch_id):
+            quiz_data = None
+            if entry.result.type == 'succeeded':
+                try:
+                    quiz_data = self._parse_quiz_response(entry.result.message.content[0].text)
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"⚠️  Error parsing batch result {entry.custom_id}: {e}")
+            yield int(entry.custom_id), quiz_data
     
-    def save_quiz_files(self, quiz_data: Dict[str, Any], output_dir: Path, quiz_number: str) -> None:
+    def save_quiz_files(self, quiz_data: Dict[str, Any], output_dir: Path, quiz_number: str, contribution_date: Optional[str] = None) -> None:
         """
         Save quiz files in the required format with proper YAML formatting.
         
@@ -524,101 +784,18 @@ Return ONLY a JSON object in this exact format:
             quiz_data: Quiz data dictionary
             output_dir: Output directory for quiz files
             quiz_number: Quiz number (e.g., "001")
+            contribution_date: Proofreading date (YYYY-MM-DD), defaults to today
         """
         quiz_dir = output_dir / quiz_number
         quiz_dir.mkdir(parents=True, exist_ok=True)
         
-        # Create question.yml (metadata)
-        today_date = datetime.now().strftime('%Y-%m-%d')
-        
-        question_data = {
-            'id': quiz_data['id'],
-            'chapterId': quiz_data['chapterId'],
-            'difficulty': quiz_data['difficulty'],
-            'duration': quiz_data['duration'],
-            'author': quiz_data['author'],
-            'original_language': quiz_data['original_language'],
-            'proofreading': [
-                {
-                    'language': 'en',
-                    'last_contribution_date': today_date,
-                    'urgency': 1,
-                    'contributor_names': self.contributor_names or [],
-                    'reward': 1
-                }
-            ]
-        }
-        
-        question_file = quiz_dir / 'question.yml'
-        
-        # Custom YAML writing to control date format
-        with open(question_file, 'w', encoding='utf-8') as f:
-            f.write(f"id: {question_data['id']}\n")
-            f.write(f"chapterId: {question_data['chapterId']}\n")
-            f.write(f"difficulty: {question_data['difficulty']}\n")
-            f.write(f"duration: {question_data['duration']}\n")
-            f.write(f"author: {question_data['author']}\n")
-            f.write(f"original_language: {question_data['original_language']}\n")
-            f.write("proofreading:\n")
-            for proof in question_data['proofreading']:
-                f.write(f"  - language: {proof['language']}\n")
-                f.write(f"    last_contribution_date: {proof['last_contribution_date']}\n")
-                f.write(f"    urgency: {proof['urgency']}\n")
-                f.write("    contributor_names:\n")
-                if proof['contributor_names']:
-                    for contributor in proof['contributor_names']:
-                        f.write(f"      - {contributor}\n")
-                else:
-                    f.write("      []\n")
-                f.write(f"    reward: {proof['reward']}\n")
+        # Create question.yml (metadata) - custom YAML writing to control date format
+        meta = QuestionMeta.from_quiz_data(quiz_data, contribution_date or date.today().isoformat(), self.contributor_names)
+        _write_text_atomic(str(quiz_dir / 'question.yml'), meta.to_yaml())
         
         # Create en.yml with proper formatting
-        en_file = quiz_dir / 'en.yml'
-        
-        # Write the YAML manually to ensure proper formatting
-        with open(en_file, 'w', encoding='utf-8') as f:
-            # Write in the desired order: question, answer, wrong_answers, explanation
-            
-            # Question - single line
-            question = quiz_data['question']
-            f.write(f"question: {question}\n")
-            
-            # Answer - single line  
-            answer = quiz_data['answer']
-            f.write(f"answer: {answer}\n")
-            
-            # Wrong answers - one per line with 2-space indentation
-            f.write("wrong_answers:\n")
-            for wrong_answer in quiz_data['wrong_answers']:
-                # Handle special characters in answers
-                if "'" in wrong_answer and '"' not in wrong_answer:
-                    f.write(f'  - "{wrong_answer}"\n')
-                elif '"' in wrong_answer and "'" not in wrong_answer:
-                    f.write(f"  - '{wrong_answer}'\n")
-                elif "'" in wrong_answer and '"' in wrong_answer:
-                    # Use literal style for complex quotes
-                    escaped = wrong_answer.replace("'", "''")
-                    f.write(f"  - '{escaped}'\n")
-                else:
-                    f.write(f"  - {wrong_answer}\n")
-            
-            # Explanation - use literal style for multi-line
-            explanation = quiz_data['explanation']
-            if '\n' in explanation or len(explanation) > 80:
-                # Use literal style for multi-line explanations
-                f.write("explanation: |\n")
-                for line in explanation.split('\n'):
-                    f.write(f"  {line}\n")
-            else:
-                # Single line explanation
-                if "'" in explanation and '"' not in explanation:
-                    f.write(f'explanation: "{explanation}"\n')
-                elif '"' in explanation and "'" not in explanation:
-                    f.write(f"explanation: '{explanation}'\n")
-                else:
-                    f.write(f"explanation: {explanation}\n")
-        
-        print(f"✅ Quiz files saved to {quiz_dir}")
+        content = EnContent.from_quiz_data(quiz_data)
+        _write_text_atomic(str(quiz_dir / 'en.yml'), content.to_yaml())
     
     def _yaml_escape_string(self, text: str) -> str:
         """
@@ -659,9 +836,19 @@ Return ONLY a JSON object in this exact format:
         
         print(f"📝 Starting quiz numbering from {start_number:03d} (found {len(existing_quizzes)} existing quizzes)")
         
-        for i, quiz_data in enumerate(quizzes):
-            quiz_number = f"{start_number + i:03d}"
-            self.save_quiz_files(quiz_data, output_dir, quiz_number)
+        # Each quiz writes to its own folder, so the writes can run concurrently;
+        # the saved folders are reported afterwards so output does not interleave
+        quiz_numbers = [f"{start_number + i:03d}" for i in range(len(quizzes))]
+        contribution_date = date.today().isoformat()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(
+                lambda quiz_data, quiz_number: self.save_quiz_files(quiz_data, output_dir, quiz_number, contribution_date),
+                quizzes,
+                quiz_numbers
+            ))
+        
+        for quiz_data, quiz_number in zip(quizzes, quiz_numbers):
+            print(f"✅ Quiz files saved to {output_dir / quiz_number}")
             print(f"   📋 Saved {quiz_data['difficulty']} question as {quiz_number}")
     
     def validate_quiz_interactively(self, quiz_data: Dict[str, Any]) -> Dict[str, Any]:
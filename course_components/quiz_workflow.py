@@ -6,22 +6,38 @@ course repositories (BEC_REPO and PREMIUM_REPO) to generate quiz questions
 with difficulty balancing and proper YAML formatting.
 """
 
+import anthropic
+import mmap
 import os
+import queue
 import re
+import shutil
+import threading
+import time
 import yaml
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple, Generator
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Set, Tuple, Generator
+from datetime import date, datetime
 import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from dataclasses import dataclass
 
 try:
-    from .quiz_generator import QuizGenerator
+    # libyaml-backed loader is much faster when PyYAML was built with it
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
+try:
+    from .quiz_generator import QuizGenerator, EnContent, _write_text_atomic
     from .utils import detect_youtube_url_type
 except ImportError:
     # Handle direct import case
-    from quiz_generator import QuizGenerator
+    from quiz_generator import QuizGenerator, EnContent, _write_text_atomic
     from utils import detect_youtube_url_type
 
 
@@ -47,6 +63,22 @@ class CourseInfo:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class ProgressEvent:
+    """Progress update yielded by QuizWorkflowManager.generate_quiz"""
+    status: str
+    message: str
+    percentage: float
+    data: Optional[Dict[str, Any]] = None
+
+
+def _report_progress(progress_callback: Optional[callable], event: ProgressEvent) -> ProgressEvent:
+    """Pass an event to the legacy (message, status, percentage) callback, then return it for yielding"""
+    if progress_callback:
+        progress_callback(event.message, event.status, event.percentage)
+    return event
+
+
 @dataclass
 class RepositoryInfo:
     """Information about a repository"""
@@ -58,6 +90,70 @@ class RepositoryInfo:
     valid: bool
 
 
+# A "## " heading followed, within the next 5 lines, by a <chapterId>...</chapterId> line.
+# The lookahead keeps headings inside that window available to later matches.
+_CHAPTER_RE = re.compile(
+    r'^## (?P<title>.*)$'
+    r'(?=(?:\n.*){0,4}?\n(?P<chapter_id_line>.*?<chapterId>(?P<chapter_id>.*?)</chapterId>.*)$)',
+    re.MULTILINE
+)
+_HEADING_RE = re.compile(r'^## ', re.MULTILINE)
+# Same pattern over raw bytes, for counting chapters without decoding the file
+_CHAPTER_BYTES_RE = re.compile(_CHAPTER_RE.pattern.encode('ascii'), re.MULTILINE)
+
+
+def _parse_chapters(content: str) -> List[Tuple[str, str, int, int]]:
+    """Locate chapters in markdown content.
+    
+    Pure function over the text: returns (title, chapter_id, start, end) tuples where
+    content[start:end] runs from the <chapterId> line to the next ## heading (or end of file).
+    """
+    spans = []
+    for match in _CHAPTER_RE.finditer(content):
+        chapter_id = match.group('chapter_id').strip()
+        if not chapter_id:
+            continue
+        
+        start = match.start('chapter_id_line')
+        next_heading = _HEADING_RE.search(content, match.end('chapter_id_line'))
+        end = next_heading.start() if next_heading else len(content)
+        spans.append((match.group('title').strip(), chapter_id, start, end))
+    return spans
+
+
+_DIFFICULTY_LEVELS = ('easy', 'intermediate', 'hard')
+
+
+@lru_cache(maxsize=64)
+def _difficulty_distribution(question_count: int, easy_proportion: float,
+                             intermediate_proportion: float, hard_proportion: float) -> Tuple[str, ...]:
+    """Largest-remainder split of question_count into easy/intermediate/hard
+    
+    Each level gets the whole part of its share, the leftover questions go to the
+    largest fractional remainders (ties in easy -> hard order), and from three
+    questions on every level gets at least one, taken from the biggest level.
+    All-zero proportions split evenly.
+    """
+    proportions = (easy_proportion, intermediate_proportion, hard_proportion)
+    total = sum(proportions)
+    if total <= 0:
+        proportions, total = (1.0, 1.0, 1.0), 3.0
+    shares = [question_count * p / total for p in proportions]
+    counts = [int(share) for share in shares]
+    # Rounded so float noise (0.7 * 5 = 3.4999...) does not break ties between equal remainders
+    by_remainder = sorted(range(3), key=lambda i: round(counts[i] - shares[i], 9))
+    for i in by_remainder[:question_count - sum(counts)]:
+        counts[i] += 1
+    
+    if question_count >= 3:
+        for i in range(3):
+            if counts[i] == 0:
+                counts[max(range(3), key=counts.__getitem__)] -= 1
+                counts[i] = 1
+    
+    return tuple(level for level, count in zip(_DIFFICULTY_LEVELS, counts) for _ in range(count))
+
+
 class QuizWorkflowManager:
     """Manages multi-repository quiz generation workflow"""
     
@@ -67,6 +163,19 @@ class QuizWorkflowManager:
         'intermediate': 0.5, 
         'hard': 0.2
     }
+    # Chapters generated concurrently in generate_quiz
+    MAX_PARALLEL_CHAPTERS = 8
+    # Questions of one chapter requested together when there are spare chapter slots
+    # (kept small: questions of the same wave cannot see each other to avoid duplicates)
+    MAX_PARALLEL_QUESTIONS_PER_CHAPTER = 3
+    # Parsed course.yml files kept by list_courses
+    METADATA_CACHE_SIZE = 256
+    # Parsed language files (with full chapter text) kept by _read_chapters
+    CHAPTER_CACHE_SIZE = 64
+    # Minimum seconds between streamed processing updates of a threaded run
+    PROGRESS_MIN_INTERVAL = 0.5
+    # Numbered folders tried before giving up when other writers keep taking them first
+    QUIZ_FOLDER_ATTEMPTS = 10
     
     def __init__(self):
         """Initialize the quiz workflow manager"""
@@ -83,15 +192,22 @@ class QuizWorkflowManager:
             }
         }
         self.quiz_generator = None
-        self._repo_cache = {}
+        self._repo_cache: Dict[str, Tuple[Optional[str], Path]] = {}
+        self._chapter_cache: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+        self._quiz_number_cache: Dict[Tuple[str, str], int] = {}
+        self._course_langs_cache: Dict[str, Tuple[int, Set[str]]] = {}
+        self._course_meta_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
         
     def _get_repo_path(self, repo_key: str) -> Optional[Path]:
-        """Get the path for a repository"""
-        if repo_key not in self.repositories:
+        """Get the path for a repository (cached per manager instance until its env var changes)"""
+        repo_info = self.repositories.get(repo_key)
+        if repo_info is None:
             return None
-            
-        repo_info = self.repositories[repo_key]
+        
         env_path = os.getenv(repo_info['env_var'])
+        cached = self._repo_cache.get(repo_key)
+        if cached and cached[0] == env_path:
+            return cached[1]
         
         if env_path:
             # Handle both absolute and relative paths
@@ -103,10 +219,13 @@ class QuizWorkflowManager:
             # Use default path (relative to current directory)
             path = Path.cwd() / repo_info['default_path']
             
-        # Check if path exists and has courses directory
-        if path.exists() and (path / 'courses').exists():
-            return path
-        return None
+        # Check if path exists and has courses directory; only found paths are cached,
+        # so a repository cloned while the app is running is picked up
+        if not (path.exists() and (path / 'courses').exists()):
+            return None
+        
+        self._repo_cache[repo_key] = (env_path, path)
+        return path
     
     def list_repositories(self) -> List[RepositoryInfo]:
         """List available repositories with their status"""
@@ -149,25 +268,31 @@ class QuizWorkflowManager:
         courses = []
         courses_dir = repo_path / 'courses'
         
-        if not courses_dir.exists():
+        # Single directory read; DirEntry.is_dir() is usually answered without a stat,
+        # and a missing folder is caught instead of probed with exists()
+        try:
+            with os.scandir(courses_dir) as entries:
+                course_entries = [entry for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
             return []
-            
-        for course_dir in courses_dir.iterdir():
-            if not course_dir.is_dir():
-                continue
+        
+        for entry in course_entries:
+            course_dir = Path(entry.path)
                 
-            # Look for course.yml or course.yaml
+            # Look for course.yml or course.yaml; the stat doubles as the cache key
             course_yml = None
-            for filename in ['course.yml', 'course.yaml']:
-                yml_path = course_dir / filename
-                if yml_path.exists():
-                    course_yml = yml_path
+            for filename in ('course.yml', 'course.yaml'):
+                candidate = os.path.join(entry.path, filename)
+                try:
+                    course_yml_stat = os.stat(candidate)
+                    course_yml = candidate
                     break
+                except FileNotFoundError:
+                    continue
                     
             if course_yml:
                 try:
-                    with open(course_yml, 'r', encoding='utf-8') as f:
-                        metadata = yaml.safe_load(f) or {}
+                    metadata = self._load_course_metadata(course_yml, course_yml_stat)
                     
                     # Use uppercase course name as title if no title in metadata
                     title = metadata.get('title', course_dir.name.upper())
@@ -183,13 +308,12 @@ class QuizWorkflowManager:
                     languages = metadata.get('languages', ['en'])
                     if languages:
                         # Try to count chapters in the first available language file
+                        course_languages = self._course_language_files(course_dir)
                         for lang in languages:
-                            lang_file = course_dir / f'{lang}.md'
-                            if lang_file.exists():
+                            if lang in course_languages:
+                                lang_file = course_dir / f'{lang}.md'
                                 try:
-                                    content = lang_file.read_text(encoding='utf-8')
-                                    chapters = self._extract_chapters_from_content(content, lang_file)
-                                    chapter_count = len(chapters)
+                                    chapter_count = self._count_chapters(lang_file)
                                     break
                                 except:
                                     pass
@@ -226,7 +350,8 @@ class QuizWorkflowManager:
                     'metadata': {}
                 })
                 
-        return sorted(courses, key=lambda x: x['name'])
+        courses.sort(key=itemgetter('name'))
+        return courses
     
     def list_chapters(self, repo_key: str, course_name: str, language: str = 'en') -> List[Dict[str, Any]]:
         """List chapters in a course for a specific language.
@@ -239,28 +364,24 @@ class QuizWorkflowManager:
 
         # The language file is in the course folder: courses/{course_name}/{language}.md
         course_path = repo_path / 'courses' / course_name
-        language_file = course_path / f'{language}.md'
+        course_languages = self._course_language_files(course_path)
         actual_language = language
 
-        if not language_file.exists():
+        if language not in course_languages:
             # Fallback to English if requested language doesn't exist
-            language_file = course_path / 'en.md'
             actual_language = 'en'
-            if not language_file.exists():
+            if 'en' not in course_languages:
                 # Fallback to any available language file
-                available_files = list(course_path.glob('*.md'))
-                if available_files:
-                    language_file = available_files[0]
-                    # Extract language from filename (e.g., 'fr.md' -> 'fr')
-                    actual_language = language_file.stem
-                else:
+                if not course_languages:
                     return []
+                actual_language = min(course_languages)
+
+        language_file = course_path / f'{actual_language}.md'
 
         chapters = []
 
         try:
-            content = language_file.read_text(encoding='utf-8')
-            chapters = self._extract_chapters_from_content(content, language_file)
+            chapters = self._read_chapters(language_file)
             # Add source language to each chapter
             for chapter in chapters:
                 chapter['source_language'] = actual_language
@@ -268,7 +389,8 @@ class QuizWorkflowManager:
             print(f"Error reading {language_file}: {e}")
             return []
 
-        return sorted(chapters, key=lambda x: x.get('order', 999))
+        # _extract_chapters_from_content numbers chapters in document order, so no sort is needed
+        return chapters
     
     def list_languages(self, repo_key: str, course_name: str) -> List[str]:
         """List available languages for a course - based on {lang}.md files"""
@@ -277,16 +399,10 @@ class QuizWorkflowManager:
             return ['en']
             
         course_path = repo_path / 'courses' / course_name
-        if not course_path.exists():
-            return ['en']
-            
         languages = []
         
         # Look for markdown files with language codes
-        for md_file in course_path.glob('*.md'):
-            # Extract language code from filename (e.g., 'en.md' -> 'en')
-            lang_code = md_file.stem
-            
+        for lang_code in self._course_language_files(course_path):
             # Check if it's a valid language code (2-10 characters)
             # This allows codes like 'en', 'zh-Hans', 'nb-NO', 'sr-Latn'
             # Basic validation: starts with letter, contains only letters, hyphens, underscores
@@ -299,51 +415,93 @@ class QuizWorkflowManager:
                     
         return sorted(languages)
     
+    def _load_course_metadata(self, course_yml: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Parse a course.yml, reusing the previous result while its mtime and size are unchanged"""
+        cached = self._course_meta_cache.get(course_yml)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        with open(course_yml, 'r', encoding='utf-8') as f:
+            metadata = yaml.load(f, Loader=YamlSafeLoader) or {}
+        
+        if len(self._course_meta_cache) >= self.METADATA_CACHE_SIZE:
+            # Far more than any repository holds; just start over rather than track recency
+            self._course_meta_cache.clear()
+        self._course_meta_cache[course_yml] = (stat.st_mtime_ns, stat.st_size, metadata)
+        return metadata
+    
+    def _course_language_files(self, course_path: Path) -> Set[str]:
+        """Language codes that have a {lang}.md file in the course folder (one directory read per course)"""
+        cache_key = str(course_path)
+        try:
+            # Adding or removing a file bumps the folder's mtime
+            mtime_ns = os.stat(cache_key).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
+        
+        cached = self._course_langs_cache.get(cache_key)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
+        with os.scandir(course_path) as entries:
+            # e.g. 'en.md' -> 'en'
+            languages = {
+                entry.name[:-3] for entry in entries
+                if entry.name.endswith('.md') and not entry.name.startswith('.')
+            }
+        self._course_langs_cache[cache_key] = (mtime_ns, languages)
+        return languages
+    
+    def _read_chapters(self, language_file: Path) -> List[Dict[str, Any]]:
+        """Read and extract chapters from a language file, cached by modification time"""
+        cache_key = str(language_file)
+        mtime_ns = language_file.stat().st_mtime_ns
+        
+        cached = self._chapter_cache.get(cache_key)
+        if cached and cached[0] == mtime_ns:
+            chapters = cached[1]
+        else:
+            # One bytes read + decode skips the incremental text layer; newlines are
+            # normalised only when the file actually has Windows/Mac line endings
+            content = language_file.read_bytes().decode('utf-8')
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            chapters = self._extract_chapters_from_content(content, language_file)
+            if len(self._chapter_cache) >= self.CHAPTER_CACHE_SIZE:
+                # The manager can live as long as the web app; start over rather than track recency
+                self._chapter_cache.clear()
+            self._chapter_cache[cache_key] = (mtime_ns, chapters)
+        
+        # Callers annotate the chapter dicts, so hand out copies
+        return [dict(chapter) for chapter in chapters]
+    
+    def _count_chapters(self, language_file: Path) -> int:
+        """Count chapters in a language file without building the chapter list"""
+        stat = language_file.stat()
+        cached = self._chapter_cache.get(str(language_file))
+        if cached and cached[0] == stat.st_mtime_ns:
+            return len(cached[1])
+        if not stat.st_size:
+            return 0
+        
+        # Scan the mapped bytes directly - the markers are ASCII, so no decode is needed
+        with open(language_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return sum(1 for match in _CHAPTER_BYTES_RE.finditer(mapped) if match.group('chapter_id').strip())
+    
     def _extract_chapters_from_content(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
         """Extract chapters from markdown content - content is from <chapterId> line to next ##"""
         chapters = []
-        lines = content.split('\n')
-        
-        # Find all ## headings and look for chapterId within the next few lines
-        for i, line in enumerate(lines):
-            if line.startswith('## '):
-                title = line[3:].strip()  # Remove '## ' prefix
-                chapter_id = None
-                chapter_id_line = None
-                
-                # Look for <chapterId> within the next 5 lines
-                for j in range(i + 1, min(i + 6, len(lines))):
-                    if '<chapterId>' in lines[j] and '</chapterId>' in lines[j]:
-                        # Extract chapter ID from the line
-                        start = lines[j].find('<chapterId>') + len('<chapterId>')
-                        end = lines[j].find('</chapterId>')
-                        chapter_id = lines[j][start:end].strip()
-                        chapter_id_line = j
-                        break
-                
-                if chapter_id and chapter_id_line:
-                    # Find where this chapter's content ends (next ## or end of file)
-                    content_start = chapter_id_line  # Start from the chapterId line
-                    content_end = len(lines)  # Default to end of file
-                    
-                    # Look for the next ## heading
-                    for k in range(chapter_id_line + 1, len(lines)):
-                        if lines[k].startswith('## '):
-                            content_end = k
-                            break
-                    
-                    # Extract chapter content (from chapterId line to next ##)
-                    chapter_lines = lines[content_start:content_end]
-                    chapter_content = '\n'.join(chapter_lines).strip()
-                    
-                    chapters.append({
-                        'title': title,
-                        'chapter_id': chapter_id,
-                        'order': len(chapters),
-                        'content': chapter_content,
-                        'file_path': str(file_path) if file_path else None,
-                        'word_count': len(chapter_content.split())
-                    })
+        
+        for title, chapter_id, start, end in _parse_chapters(content):
+            chapter_content = content[start:end].strip()
+            chapters.append({
+                'title': title,
+                'chapter_id': chapter_id,
+                'order': len(chapters),
+                'content': chapter_content,
+                'file_path': str(file_path) if file_path else None,
+                'word_count': len(chapter_content.split())
+            })
         
         return chapters
     
@@ -355,7 +513,8 @@ class QuizWorkflowManager:
             contributors: List of contributor names
             language: Language code for quiz generation
         """
-        # Always create a new generator with the specified language
+        # Always create a new generator with the specified language; generators are
+        # cheap since they all share the process-wide Anthropic client
         self.quiz_generator = QuizGenerator(language=language)
             
         self.quiz_generator.author = author
@@ -363,145 +522,221 @@ class QuizWorkflowManager:
         
         return self.quiz_generator
     
-    def _balance_difficulty(self, question_count: int, difficulty_proportions: Dict[str, float] = None) -> List[str]:
+    def _balance_difficulty(self, question_count: int, difficulty_proportions: Dict[str, float] = None) -> Tuple[str, ...]:
         """Calculate difficulty distribution for questions"""
         if not difficulty_proportions:
             difficulty_proportions = self.DEFAULT_DIFFICULTY_PROPORTIONS
             
-        difficulties = []
-        
-        easy_count = max(1, round(question_count * difficulty_proportions['easy']))
-        hard_count = max(1, round(question_count * difficulty_proportions['hard']))
-        intermediate_count = question_count - easy_count - hard_count
-        
-        # Ensure we have at least one of each if question count allows
-        if question_count >= 3:
-            easy_count = max(1, easy_count)
-            hard_count = max(1, hard_count)
-            intermediate_count = max(1, intermediate_count)
-            
-            # Adjust if total exceeds question count
-            total = easy_count + intermediate_count + hard_count
-            if total > question_count:
-                # Reduce intermediate first, then easy, then hard
-                excess = total - question_count
-                if intermediate_count > excess:
-                    intermediate_count -= excess
-                else:
-                    easy_count = max(1, easy_count - (excess - max(0, intermediate_count - 1)))
-                    intermediate_count = max(1, intermediate_count)
-                    
-        difficulties.extend(['easy'] * easy_count)
-        difficulties.extend(['intermediate'] * intermediate_count) 
-        difficulties.extend(['hard'] * hard_count)
-        
-        return difficulties[:question_count]
+        return _difficulty_distribution(
+            question_count,
+            difficulty_proportions.get('easy', 0.0),
+            difficulty_proportions.get('intermediate', 0.0),
+            difficulty_proportions.get('hard', 0.0)
+        )
     
     def _get_next_quiz_number(self, repo_key: str, course_name: str) -> str:
         """Get the next available 3-digit quiz folder number"""
+        # Numbers handed out earlier in this run avoid rescanning the quizz folder
+        cache_key = (repo_key, course_name)
+        if cache_key in self._quiz_number_cache:
+            return f"{self._quiz_number_cache[cache_key] + 1:03d}"
+        
         repo_path = self._get_repo_path(repo_key)
         if not repo_path:
             return "001"
             
-        quizz_path = repo_path / 'courses' / course_name / 'quizz'
+        quizz_path = os.path.join(repo_path, 'courses', course_name, 'quizz')
         
-        if not quizz_path.exists():
-            return "001"
-        
-        # Find existing numbered folders
-        existing_numbers = []
-        for item in quizz_path.iterdir():
-            if item.is_dir() and item.name.isdigit() and len(item.name) == 3:
-                existing_numbers.append(int(item.name))
-        
-        if not existing_numbers:
+        # Track the highest existing numbered folder in a single pass
+        max_number = 0
+        try:
+            with os.scandir(quizz_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if len(name) == 3 and name.isdigit() and entry.is_dir():
+                        max_number = max(max_number, int(name))
+        except FileNotFoundError:
             return "001"
         
-        # Return the next number after the highest existing one
-        next_num = max(existing_numbers) + 1
-        return f"{next_num:03d}"
+        self._quiz_number_cache[cache_key] = max_number
+        return f"{max_number + 1:03d}"
     
-    def _save_quiz_question(self, repo_key: str, course_name: str, question_data: Dict[str, Any], language: str = 'en') -> str:
+    def _save_quiz_question(self, repo_key: str, course_name: str, question_data: Dict[str, Any], language: str = 'en', contribution_date: Optional[str] = None) -> str:
         """Save a quiz question to the repository structure"""
+        folder_num, question_dir = self._reserve_quiz_folder(repo_key, course_name)
+        self._write_quiz_question(question_dir, question_data, language, contribution_date)
+        return folder_num
+    
+    def _reserve_quiz_folder(self, repo_key: str, course_name: str) -> Tuple[str, str]:
+        """Create the next numbered question folder and return its number and path
+        
+        Only this step has to be serialized between concurrent savers; the files
+        can then be written into the folder in parallel.
+        """
         repo_path = self._get_repo_path(repo_key)
         if not repo_path:
             raise ValueError(f"Repository {repo_key} not found")
         
-        # Create quizz directory if it doesn't exist
-        quizz_path = repo_path / 'courses' / course_name / 'quizz'
-        quizz_path.mkdir(parents=True, exist_ok=True)
-        
-        # Get the next available folder number
-        folder_num = self._get_next_quiz_number(repo_key, course_name)
-        question_dir = quizz_path / folder_num
-        question_dir.mkdir(exist_ok=True)
-        
-        # Save metadata (question.yml)
-        metadata_file = question_dir / 'question.yml'
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            f.write(f"id: {question_data.get('id', str(uuid.uuid4()))}\n")
-            f.write(f"chapterId: {question_data.get('chapter_id', '')}\n")
-            f.write(f"difficulty: {question_data.get('difficulty', 'intermediate')}\n")
-            f.write(f"duration: {question_data.get('duration', 30)}\n")
-            f.write(f"author: {question_data.get('author', 'Course Ally')}\n")
-            f.write(f"original_language: {language}\n")
-            f.write(f"proofreading:\n")
-            f.write(f"  - language: {language}\n")
-            f.write(f"    last_contribution_date: {datetime.now().strftime('%Y-%m-%d')}\n")
-            f.write(f"    urgency: 1\n")
-            f.write(f"    contributor_names:\n")
-            
-            # Add contributor names if available
+        # Called once per generated question - plain string paths avoid Path object churn
+        quizz_path = os.path.join(repo_path, 'courses', course_name, 'quizz')
+        cache_key = (repo_key, course_name)
+        if cache_key not in self._quiz_number_cache:
+            # Create quizz directory if it doesn't exist (only needed before the first save of a run)
+            os.makedirs(quizz_path, exist_ok=True)
+        
+        # Get the next available folder number; mkdir fails instead of reusing a folder
+        # another writer created, so an existing quiz is never overwritten
+        for _ in range(self.QUIZ_FOLDER_ATTEMPTS):
+            folder_num = self._get_next_quiz_number(repo_key, course_name)
+            question_dir = os.path.join(quizz_path, folder_num)
+            try:
+                os.mkdir(question_dir)
+            except FileExistsError:
+                # Folder created outside this run - rescan for the real next number
+                self._quiz_number_cache.pop(cache_key, None)
+                continue
+            self._quiz_number_cache[cache_key] = int(folder_num)
+            return folder_num, question_dir
+        raise RuntimeError(
+            f"Could not reserve a quiz folder in {quizz_path} after {self.QUIZ_FOLDER_ATTEMPTS} attempts"
+        )
+    
+    def _write_quiz_question(self, question_dir: str, question_data: Dict[str, Any], language: str = 'en', contribution_date: Optional[str] = None) -> None:
+        """Write question.yml and {language}.yml into a reserved question folder
+        
+        contribution_date (YYYY-MM-DD) defaults to today; callers saving many
+        questions compute it once and pass it in. If a write fails the folder is
+        removed again, so no half-written question is left behind.
+        """
+        try:
+            # Save metadata (question.yml) in a single write
             contributor = question_data.get('author', 'Course Ally')
-            f.write(f"    - {contributor}\n")
-            
-            f.write(f"    reward: 1\n")
-        
-        # Save content ({language}.yml) with proper field order and formatting
-        content_file = question_dir / f'{language}.yml'
-        with open(content_file, 'w', encoding='utf-8') as f:
-            # Write fields in the desired order
-            # Question - single line
-            question = question_data.get('question', '')
-            f.write(f"question: {question}\n")
-            
-            # Answer - single line
-            answer = question_data.get('answer', '')
-            f.write(f"answer: {answer}\n")
-            
-            # Wrong answers - one per line with 2-space indentation
-            f.write("wrong_answers:\n")
-            wrong_answers = question_data.get('wrong_answers', [])
-            for wrong_answer in wrong_answers:
-                # Escape quotes if needed
-                if "'" in wrong_answer and '"' not in wrong_answer:
-                    f.write(f'  - "{wrong_answer}"\n')
-                elif '"' in wrong_answer and "'" not in wrong_answer:
-                    f.write(f"  - '{wrong_answer}'\n")
-                elif "'" in wrong_answer and '"' in wrong_answer:
-                    # Use literal style for complex quotes
-                    escaped = wrong_answer.replace("'", "''")
-                    f.write(f"  - '{escaped}'\n")
-                else:
-                    f.write(f"  - {wrong_answer}\n")
+            metadata_lines = [
+                f"id: {question_data.get('id') or uuid.uuid4()}",
+                f"chapterId: {question_data.get('chapter_id', '')}",
+                f"difficulty: {question_data.get('difficulty', 'intermediate')}",
+                f"duration: {question_data.get('duration', 30)}",
+                f"author: {question_data.get('author', 'Course Ally')}",
+                f"original_language: {language}",
+                "proofreading:",
+                f"  - language: {language}",
+                f"    last_contribution_date: {contribution_date or date.today().isoformat()}",
+                "    urgency: 1",
+                "    contributor_names:",
+                f"    - {contributor}",
+                "    reward: 1",
+            ]
+            _write_text_atomic(os.path.join(question_dir, 'question.yml'), '\n'.join(metadata_lines) + '\n')
+        
+            # Save content ({language}.yml) with proper field order and formatting
+            content = EnContent(
+                question=question_data.get('question', ''),
+                answer=question_data.get('answer', ''),
+                wrong_answers=question_data.get('wrong_answers', []),
+                explanation=question_data.get('explanation', '')
+            )
+            _write_text_atomic(os.path.join(question_dir, f'{language}.yml'), content.to_yaml())
+        except BaseException:
+            shutil.rmtree(question_dir, ignore_errors=True)
+            raise
+    
+    def _generate_questions_with_batch(
+        self,
+        generator: QuizGenerator,
+        repo_key: str,
+        course_name: str,
+        chapters: List[Dict[str, Any]],
+        difficulties: Tuple[str, ...],
+        questions_per_chapter: int,
+        quizz_path: Path,
+        language: str,
+        author: str,
+        saved_folders: List[str],
+        generated_counts: Counter,
+        progress_callback: Optional[callable] = None
+    ) -> Generator['ProgressEvent', None, None]:
+        """
+        Generate every question through a single Message Batch and save the results.
+        
+        Each saved question's folder is appended to saved_folders and its difficulty
+        counted in generated_counts. The batch is cancelled if the consumer stops iterating before it has ended.
+        """
+        def event(message: str, status: str, percentage: float, data: Dict[str, Any] = None) -> ProgressEvent:
+            return _report_progress(progress_callback, ProgressEvent(status, message, percentage, data))
+        
+        jobs = []
+        for i, chapter in enumerate(chapters):
+            if not chapter.get('content') or len(chapter['content']) <= 100:
+                yield event(f"Skipping chapter {chapter['title']} - no content", "warning", 30)
+                continue
+            if not generator.chapter_fits_context(chapter['content']):
+                yield event(f"Skipping chapter {chapter['title']} - content too long for a single prompt", "warning", 30)
+                continue
             
-            # Explanation - use literal style for multi-line
-            explanation = question_data.get('explanation', '')
-            if '\n' in explanation or len(explanation) > 80:
-                # Use literal style for multi-line explanations
-                f.write("explanation: |\n")
-                for line in explanation.split('\n'):
-                    f.write(f"  {line}\n")
-            else:
-                # Single line explanation
-                if "'" in explanation and '"' not in explanation:
-                    f.write(f'explanation: "{explanation}"\n')
-                elif '"' in explanation and "'" not in explanation:
-                    f.write(f"explanation: '{explanation}'\n")
-                else:
-                    f.write(f"explanation: {explanation}\n")
+            existing_questions = generator._load_existing_questions_for_chapter(quizz_path, chapter['chapter_id'], language)
+            chapter_start_idx = i * questions_per_chapter
+            for difficulty in difficulties[chapter_start_idx:chapter_start_idx + questions_per_chapter]:
+                jobs.append({
+                    'chapter': chapter,
+                    'chapter_content': chapter['content'],
+                    'chapter_name': chapter['title'],
+                    'difficulty': difficulty,
+                    'existing_questions': existing_questions
+                })
         
-        return folder_num
+        if not jobs:
+            return
+        
+        batch_id = generator.submit_quiz_batch(jobs)
+        yield event(f"Submitted {len(jobs)} questions as batch {batch_id}", "processing", 35, {"batch_id": batch_id})
+        
+        batch_ended = False
+        try:
+            for batch in generator.wait_for_quiz_batch(batch_id):
+                counts = batch.request_counts
+                done = counts.succeeded + counts.errored + counts.canceled + counts.expired
+                yield event(
+                    f"Batch {batch.processing_status}: {done}/{len(jobs)} questions processed",
+                    "processing",
+                    35 + (done / len(jobs)) * 30
+                )
+            batch_ended = True
+        finally:
+            if not batch_ended:
+                try:
+                    generator.client.messages.batches.cancel(batch_id)
+                except Exception as e:
+                    print(f"⚠️  Could not cancel batch {batch_id}: {e}")
+        
+        contribution_date = date.today().isoformat()
+        # Results arrive in any order, so progress follows how many have been handled
+        for completed, (index, question_data) in enumerate(generator.iter_quiz_batch_results(batch_id), 1):
+            job = jobs[index]
+            percentage = 65 + (completed / len(jobs)) * 15
+            if not question_data:
+                yield event(f"Failed to generate question for chapter {job['chapter_name']}", "warning", percentage)
+                continue
+            
+            question_data['id'] = str(uuid.uuid4())
+            question_data['chapter_id'] = job['chapter']['chapter_id']
+            question_data['difficulty'] = job['difficulty']
+            question_data['duration'] = generator._get_duration_for_difficulty(job['difficulty'])
+            question_data['author'] = author
+            folder_num = self._save_quiz_question(
+                repo_key=repo_key,
+                course_name=course_name,
+                question_data=question_data,
+                language=language,
+                contribution_date=contribution_date
+            )
+            saved_folders.append(folder_num)
+            generated_counts[question_data['difficulty']] += 1
+            yield event(
+                f"Saved question {len(saved_folders)}/{len(jobs)} to folder {folder_num}",
+                "processing",
+                percentage,
+                {"questions_generated": len(saved_folders), "saved_to": folder_num}
+            )
     
     def generate_quiz(
         self,
@@ -513,8 +748,9 @@ class QuizWorkflowManager:
         difficulty_proportions: Dict[str, float] = None,
         author: str = 'Course Ally',
         contributors: List[str] = None,
-        progress_callback: Optional[callable] = None
-    ) -> Generator[Dict[str, Any], None, None]:
+        progress_callback: Optional[callable] = None,
+        use_batch_api: bool = False
+    ) -> Generator['ProgressEvent', None, None]:
         """
         Generate quiz questions with progress updates
         
@@ -528,47 +764,43 @@ class QuizWorkflowManager:
             author: Quiz author name
             contributors: List of contributor names
             progress_callback: Function to call with progress updates
+            use_batch_api: Submit all questions as one Message Batch (half price, but
+                results can take up to 24 hours and questions in the same run cannot
+                see each other for duplicate avoidance)
             
         Yields:
-            Dict with status, message, percentage, and data
+            ProgressEvent with status, message, percentage, and optional data
         """
         try:
-            if progress_callback:
-                progress_callback("Initializing quiz generator...", "processing", 5)
-            yield {"status": "processing", "message": "Initializing quiz generator...", "percentage": 5}
+            yield _report_progress(progress_callback, ProgressEvent("processing", "Initializing quiz generator...", 5))
             
             # Initialize quiz generator with language support
             generator = self._initialize_quiz_generator(author, contributors, language)
             
-            if progress_callback:
-                progress_callback("Loading course chapters...", "processing", 10)
-            yield {"status": "processing", "message": "Loading course chapters...", "percentage": 10}
+            yield _report_progress(progress_callback, ProgressEvent("processing", "Loading course chapters...", 10))
             
             # Get all chapters for the course
             all_chapters = self.list_chapters(repo_key, course_name, language)
             
             # Filter to requested chapter IDs
-            selected_chapters = [ch for ch in all_chapters if ch['chapter_id'] in chapter_ids]
+            chapter_id_set = set(chapter_ids)
+            selected_chapters = [ch for ch in all_chapters if ch['chapter_id'] in chapter_id_set]
 
             if not selected_chapters:
                 error_msg = f"No chapters found for IDs: {chapter_ids}"
-                if progress_callback:
-                    progress_callback(error_msg, "error", 100)
-                yield {"status": "error", "message": error_msg, "percentage": 100}
+                yield _report_progress(progress_callback, ProgressEvent("error", error_msg, 100))
                 return
 
             # Detect actual source language from chapters (in case of fallback)
             actual_language = selected_chapters[0].get('source_language', language)
             if actual_language != language:
                 # Re-initialize generator with actual source language
-                if progress_callback:
-                    progress_callback(f"Using source language: {actual_language}", "processing", 12)
-                yield {
-                    "status": "processing",
-                    "message": f"Using source language: {actual_language}",
-                    "percentage": 12,
-                    "data": {"source_language": actual_language}
-                }
+                yield _report_progress(progress_callback, ProgressEvent(
+                    status="processing",
+                    message=f"Using source language: {actual_language}",
+                    percentage=12,
+                    data={"source_language": actual_language}
+                ))
                 generator = self._initialize_quiz_generator(author, contributors, actual_language)
                 language = actual_language  # Update language for saving quiz files
 
@@ -577,240 +809,261 @@ class QuizWorkflowManager:
             
             if not chapters_with_content:
                 # Fallback: try to generate from existing quiz files only
-                if progress_callback:
-                    progress_callback("No chapter content available - using existing quiz files only", "processing", 25)
-                yield {
-                    "status": "processing", 
-                    "message": "No chapter content available - using existing quiz files only", 
-                    "percentage": 25,
-                    "data": {"fallback_mode": True}
-                }
+                yield _report_progress(progress_callback, ProgressEvent(
+                    status="processing", 
+                    message="No chapter content available - using existing quiz files only", 
+                    percentage=25,
+                    data={"fallback_mode": True}
+                ))
                 selected_chapters = selected_chapters  # Use chapters without content for existing quiz loading
             else:
                 selected_chapters = chapters_with_content
                 
-            if progress_callback:
-                progress_callback(f"Found {len(selected_chapters)} chapters", "processing", 20)
-            yield {
-                "status": "processing", 
-                "message": f"Found {len(selected_chapters)} chapters", 
-                "percentage": 20,
-                "data": {"chapters_found": len(selected_chapters)}
-            }
+            yield _report_progress(progress_callback, ProgressEvent(
+                status="processing", 
+                message=f"Found {len(selected_chapters)} chapters", 
+                percentage=20,
+                data={"chapters_found": len(selected_chapters)}
+            ))
             
             # Calculate difficulty distribution for ALL questions (question_count * chapters)
             total_questions = question_count * len(selected_chapters)
             difficulties = self._balance_difficulty(total_questions, difficulty_proportions)
+            difficulty_counts = Counter(difficulties)
             
-            if progress_callback:
-                progress_callback(f"Generating {total_questions} questions ({question_count} per chapter) with balanced difficulty", "processing", 30)
-            yield {
-                "status": "processing",
-                "message": f"Generating {total_questions} questions ({question_count} per chapter) with balanced difficulty",
-                "percentage": 30,
-                "data": {
+            yield _report_progress(progress_callback, ProgressEvent(
+                status="processing",
+                message=f"Generating {total_questions} questions ({question_count} per chapter) with balanced difficulty",
+                percentage=30,
+                data={
                     "difficulty_distribution": {
-                        "easy": difficulties.count('easy'),
-                        "intermediate": difficulties.count('intermediate'),
-                        "hard": difficulties.count('hard')
+                        "easy": difficulty_counts['easy'],
+                        "intermediate": difficulty_counts['intermediate'],
+                        "hard": difficulty_counts['hard']
                     }
                 }
-            }
+            ))
             
             # Generate questions - question_count for EACH chapter
-            all_questions = []
+            # The question text lives on disk once saved; the summary only needs
+            # the folders and a running count per difficulty
+            saved_folders: List[str] = []
+            generated_counts = Counter()
+            # Stamped on every saved question, so compute it once per run
+            contribution_date = date.today().isoformat()
             questions_per_chapter = question_count  # Generate requested number for each chapter
-            
-            for i, chapter in enumerate(selected_chapters):
-                chapter_start_percentage = 30 + (i / len(selected_chapters)) * 50
-                chapter_end_percentage = 30 + ((i + 1) / len(selected_chapters)) * 50
-                
-                if progress_callback:
-                    progress_callback(f"Processing chapter: {chapter['title']}", "processing", chapter_start_percentage)
-                yield {
-                    "status": "processing",
-                    "message": f"Processing chapter: {chapter['title']}",
-                    "percentage": chapter_start_percentage,
-                    "data": {"current_chapter": chapter['title']}
-                }
-                
-                # Each chapter gets the requested number of questions
-                chapter_question_count = questions_per_chapter
-                
-                # Get difficulties for this chapter
-                chapter_start_idx = i * questions_per_chapter
-                chapter_end_idx = chapter_start_idx + chapter_question_count
-                chapter_difficulties = difficulties[chapter_start_idx:chapter_end_idx]
-                
-                # Get quizz path for incremental saving
-                repo_path = self._get_repo_path(repo_key)
-                quizz_path = repo_path / 'courses' / course_name / 'quizz'
-                quizz_path.mkdir(parents=True, exist_ok=True)
-                
-                # Generate new questions for each difficulty with incremental saving
-                for q_idx, difficulty in enumerate(chapter_difficulties):
-                    question_percentage = chapter_start_percentage + (q_idx / len(chapter_difficulties)) * (chapter_end_percentage - chapter_start_percentage)
-                    
+
+            # Get quizz path for incremental saving
+            repo_path = self._get_repo_path(repo_key)
+            quizz_path = repo_path / 'courses' / course_name / 'quizz'
+            quizz_path.mkdir(parents=True, exist_ok=True)
+
+            if use_batch_api:
+                yield from self._generate_questions_with_batch(
+                    generator, repo_key, course_name, selected_chapters, difficulties,
+                    questions_per_chapter, quizz_path, language, author, saved_folders,
+                    generated_counts, progress_callback
+                )
+            else:
+                # Chapters are generated concurrently since Claude calls are network-bound.
+                # Questions within a chapter stay sequential so each one sees the previous ones
+                # for duplicate avoidance. Workers report progress through a queue drained below.
+                events = queue.Queue()
+                save_lock = threading.Lock()
+                cancelled = threading.Event()
+                fatal_errors = []
+                # Questions saved, failed or skipped so far, across all chapters
+                handled_questions = 0
+
+                def queue_event(message: str, status: str, data: Dict[str, Any] = None, callback_only: bool = False, handled: int = 0) -> None:
+                    """Queue a progress event; callers hold save_lock, so percentages reach the queue in order"""
+                    nonlocal handled_questions
+                    handled_questions += handled
+                    percentage = 30 + (handled_questions / max(total_questions, 1)) * 50
+                    events.put((ProgressEvent(status, message, percentage, data), callback_only))
+
+                def generate_chapter_questions(i: int, chapter: Dict[str, Any]) -> None:
+                    def emit(message: str, status: str, data: Dict[str, Any] = None, callback_only: bool = False, handled: int = 0) -> None:
+                        with save_lock:
+                            queue_event(message, status, data, callback_only, handled)
+
+                    def write_question(question_dir: str, folder_num: str, question_file_data: Dict[str, Any]) -> None:
+                        self._write_quiz_question(question_dir, question_file_data, language, contribution_date)
+                        with save_lock:
+                            saved_folders.append(folder_num)
+                            generated_counts[question_file_data['difficulty']] += 1
+                            questions_generated = len(saved_folders)
+                            queue_event(f"Generated and saved question {questions_generated}/{total_questions} to folder {folder_num}", "processing",
+                                        {"questions_generated": questions_generated, "saved_to": folder_num}, handled=1)
+
+                    pending_writes = []
+
+                    # Per-chapter values used on every question
+                    chapter_title = chapter['title']
+                    chapter_id = chapter['chapter_id']
+                    chapter_content = chapter.get('content')
+
                     try:
+                        emit(f"Processing chapter: {chapter_title}", "processing", {"current_chapter": chapter_title})
+
+                        # Each chapter gets the requested number of questions
+                        chapter_question_count = questions_per_chapter
+
+                        # Get difficulties for this chapter
+                        chapter_start_idx = i * questions_per_chapter
+                        chapter_end_idx = chapter_start_idx + chapter_question_count
+                        chapter_difficulties = difficulties[chapter_start_idx:chapter_end_idx]
+
+                        # Load existing questions for this chapter once; new ones are appended as they are saved
+                        existing_questions = generator._load_existing_questions_for_chapter(quizz_path, chapter_id, language)
+
                         # Check if we have chapter content for generation
-                        has_content = 'content' in chapter and chapter['content'] and len(chapter['content']) > 100
-                        
+                        has_content = chapter_content and len(chapter_content) > 100
                         if not has_content:
                             # Skip generation but continue with existing questions if available
-                            existing_questions = generator._load_existing_questions_for_chapter(quizz_path, chapter['chapter_id'], language)
                             if len(existing_questions) == 0:
-                                if progress_callback:
-                                    progress_callback(f"Skipping chapter {chapter['title']} - no content or existing questions", "warning", question_percentage)
-                                yield {
-                                    "status": "warning",
-                                    "message": f"Skipping chapter {chapter['title']} - no content or existing questions",
-                                    "percentage": question_percentage
-                                }
-                            continue
-                            
-                        # Load existing questions for this chapter to avoid duplicates
-                        existing_questions = generator._load_existing_questions_for_chapter(quizz_path, chapter['chapter_id'], language)
-                        
-                        if progress_callback:
-                            existing_count = len(existing_questions)
-                            if existing_count > 0:
-                                progress_callback(f"Found {existing_count} existing questions for chapter {chapter['chapter_id']}", "processing", question_percentage)
-                        
-                        # Generate quiz with duplicate avoidance
-                        question_data = generator._generate_quiz_with_claude_avoiding_duplicates(
-                            chapter['content'],
-                            chapter['title'], 
-                            difficulty,
-                            existing_questions
-                        )
-                        
-                        if question_data:
-                            # Add metadata to question
-                            enhanced_question = {
-                                **question_data,
-                                'id': str(uuid.uuid4()),
-                                'chapter_id': chapter['chapter_id'],
-                                'chapter_title': chapter['title'],
-                                'difficulty': difficulty,
-                                'question_number': len(all_questions) + 1,
-                                'duration': generator._get_duration_for_difficulty(difficulty),
-                                'generated_at': datetime.now().isoformat(),
-                                'source': 'generated'
-                            }
-                            
-                            # Save immediately to avoid loss and enable duplicate detection
-                            folder_num = self._save_quiz_question(
-                                repo_key=repo_key,
-                                course_name=course_name,
-                                question_data={
-                                    'id': enhanced_question.get('id'),
-                                    'chapter_id': enhanced_question.get('chapter_id'),
-                                    'difficulty': enhanced_question.get('difficulty'),
-                                    'duration': enhanced_question.get('duration'),
-                                    'author': author,
-                                    'question': enhanced_question.get('question'),
-                                    'answer': enhanced_question.get('answer'),
-                                    'wrong_answers': enhanced_question.get('wrong_answers'),
-                                    'explanation': enhanced_question.get('explanation')
-                                },
-                                language=language
-                            )
-                            
-                            enhanced_question['saved_folder'] = folder_num
-                            all_questions.append(enhanced_question)
-                            
-                            if progress_callback:
-                                progress_callback(f"Generated and saved question {len(all_questions)}/{total_questions} to folder {folder_num}", "processing", question_percentage)
-                            yield {
-                                "status": "processing",
-                                "message": f"Generated and saved question {len(all_questions)}/{total_questions} to folder {folder_num}",
-                                "percentage": question_percentage,
-                                "data": {"questions_generated": len(all_questions), "saved_to": folder_num}
-                            }
-                        else:
-                            if progress_callback:
-                                progress_callback(f"Failed to generate question {len(all_questions) + 1}", "warning", question_percentage)
-                            yield {
-                                "status": "warning",
-                                "message": f"Failed to generate question {len(all_questions) + 1}",
-                                "percentage": question_percentage
-                            }
-                            
-                    except Exception as e:
-                        error_msg = f"Error generating question: {str(e)}"
-                        if progress_callback:
-                            progress_callback(error_msg, "warning", question_percentage)
-                        yield {
-                            "status": "warning",
-                            "message": error_msg,
-                            "percentage": question_percentage
-                        }
-                        continue
-                            
-                        question_data = generator._generate_quiz_with_claude(
-                            chapter['content'],
-                            chapter['title'], 
-                            difficulty,
-                            len(all_questions) + 1
-                        )
-                        
-                        if question_data:
-                            # Add metadata to question
-                            enhanced_question = {
-                                **question_data,
-                                'id': str(uuid.uuid4()),
-                                'chapter_id': chapter['chapter_id'],
-                                'chapter_title': chapter['title'],
-                                'difficulty': difficulty,
-                                'question_number': len(all_questions) + 1,
-                                'duration': generator._get_duration_for_difficulty(difficulty),
-                                'generated_at': datetime.now().isoformat(),
-                                'source': 'generated'
-                            }
-                            
-                            all_questions.append(enhanced_question)
-                            
-                            if progress_callback:
-                                progress_callback(f"Generated question {len(all_questions)}/{total_questions}", "processing", question_percentage)
-                            yield {
-                                "status": "processing",
-                                "message": f"Generated question {len(all_questions)}/{total_questions}",
-                                "percentage": question_percentage,
-                                "data": {"questions_generated": len(all_questions)}
-                            }
-                        else:
-                            if progress_callback:
-                                progress_callback(f"Failed to generate question {len(all_questions) + 1}", "warning", question_percentage)
-                            yield {
-                                "status": "warning",
-                                "message": f"Failed to generate question {len(all_questions) + 1}",
-                                "percentage": question_percentage
-                            }
-                            
-                    except Exception as e:
-                        error_msg = f"Error generating question: {str(e)}"
-                        if progress_callback:
-                            progress_callback(error_msg, "warning", question_percentage)
-                        yield {
-                            "status": "warning",
-                            "message": error_msg,
-                            "percentage": question_percentage
-                        }
-                        continue
-                
-                # Break if we have enough questions
-                # Don't break early - continue generating for all chapters
+                                emit(f"Skipping chapter {chapter_title} - no content or existing questions", "warning",
+                                     handled=len(chapter_difficulties))
+                            return
+
+                        if not generator.chapter_fits_context(chapter_content):
+                            # Every request for this chapter would be rejected as too long
+                            emit(f"Skipping chapter {chapter_title} - content too long for a single prompt", "warning",
+                                 handled=len(chapter_difficulties))
+                            return
+
+                        existing_count = len(existing_questions)
+                        if existing_count > 0:
+                            emit(f"Found {existing_count} existing questions for chapter {chapter_id}", "processing",
+                                 callback_only=True)
+
+                        # Generate new questions for each difficulty with incremental saving. Questions are
+                        # requested in waves: those of one wave run concurrently and avoid everything saved
+                        # before the wave, so waves are only wider than one when chapter workers leave room
+                        for wave_start in range(0, len(chapter_difficulties), questions_per_wave):
+                            if cancelled.is_set():
+                                return
+
+                            wave = chapter_difficulties[wave_start:wave_start + questions_per_wave]
+                            known_questions = list(existing_questions)
+                            wave_futures = [
+                                question_pool.submit(
+                                    generator._generate_quiz_with_claude_avoiding_duplicates,
+                                    chapter_content,
+                                    chapter_title,
+                                    difficulty,
+                                    known_questions
+                                )
+                                for difficulty in wave
+                            ]
+
+                            for q_idx, (difficulty, question_future) in enumerate(zip(wave, wave_futures), start=wave_start):
+                                try:
+                                    # Generate quiz with duplicate avoidance
+                                    question_data = question_future.result()
+
+                                    if question_data:
+                                        # The parsed question is ours alone; add the saved metadata in place
+                                        question_data['id'] = str(uuid.uuid4())
+                                        question_data['chapter_id'] = chapter_id
+                                        question_data['difficulty'] = difficulty
+                                        question_data['duration'] = generator._get_duration_for_difficulty(difficulty)
+                                        question_data['author'] = author
+
+                                        # Only folder numbering is serialized across workers; the files are written in parallel
+                                        with save_lock:
+                                            folder_num, question_dir = self._reserve_quiz_folder(repo_key, course_name)
+
+                                        # Save right away to avoid loss, but on the writer pool so the next
+                                        # Claude request for this chapter does not wait for the disk
+                                        pending_writes.append(writer.submit(write_question, question_dir, folder_num, question_data))
+
+                                        # Later questions for this chapter must avoid this one too
+                                        existing_questions.append({
+                                            'question': question_data['question'],
+                                            'difficulty': difficulty
+                                        })
+                                    else:
+                                        emit(f"Failed to generate question {len(saved_folders) + 1}", "warning", handled=1)
+
+                                except generator.FATAL_API_ERRORS as e:
+                                    # No point in sending the remaining questions of any chapter
+                                    fatal_errors.append(e)
+                                    cancelled.set()
+                                    return
+                                except anthropic.RateLimitError:
+                                    emit(f"Rate limited by Claude, skipping question {q_idx + 1} of chapter {chapter_title}", "warning", handled=1)
+                                    continue
+                                except Exception as e:
+                                    emit(f"Error generating question: {str(e)}", "warning", handled=1)
+                                    continue
+                    finally:
+                        # The chapter only counts as done once its questions are on disk
+                        for write in pending_writes:
+                            try:
+                                write.result()
+                            except Exception as e:
+                                emit(f"Error saving question: {str(e)}", "warning", handled=1)
+                        # Tell the consumer this chapter is done
+                        events.put(None)
+
+                max_workers = min(self.MAX_PARALLEL_CHAPTERS, len(selected_chapters))
+                # With fewer chapters than worker slots, let each chapter request a few questions at once
+                questions_per_wave = max(1, min(self.MAX_PARALLEL_QUESTIONS_PER_CHAPTER, self.MAX_PARALLEL_CHAPTERS // len(selected_chapters)))
+                # Claude calls and question files run on their own pools; both are closed after
+                # the chapter workers, which wait for their own questions before finishing
+                with ThreadPoolExecutor(max_workers=2) as writer, \
+                        ThreadPoolExecutor(max_workers=max_workers * questions_per_wave) as question_pool, \
+                        ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [executor.submit(generate_chapter_questions, i, chapter) for i, chapter in enumerate(selected_chapters)]
+                    try:
+                        finished_chapters = 0
+                        last_yielded_percentage = -1
+                        last_yield_time = 0.0
+                        while finished_chapters < len(futures):
+                            item = events.get()
+                            if item is None:
+                                finished_chapters += 1
+                                continue
+
+                            event, callback_only = item
+                            _report_progress(progress_callback, event)
+                            if callback_only:
+                                continue
+
+                            # Only yield intermediate processing updates when the whole percentage moves and
+                            # the last one is at least PROGRESS_MIN_INTERVAL old; warnings and per-question
+                            # "saved" updates (the ones streamed to the web client) always go through
+                            percentage = int(event.percentage)
+                            now = time.monotonic()
+                            question_saved = bool(event.data) and 'saved_to' in event.data
+                            if event.status == 'processing' and not question_saved and (
+                                percentage == last_yielded_percentage
+                                or now - last_yield_time < self.PROGRESS_MIN_INTERVAL
+                            ):
+                                continue
+                            last_yielded_percentage = percentage
+                            last_yield_time = now
+                            yield event
+                    finally:
+                        # Stop workers early if the consumer stops iterating
+                        cancelled.set()
+
+                # Surface unexpected worker failures
+                for future in futures:
+                    future.result()
+
+                if fatal_errors:
+                    error_msg = f"Quiz generation stopped: {fatal_errors[0]}"
+                    yield _report_progress(progress_callback, ProgressEvent("error", error_msg, 100))
+                    return
             
-            if not all_questions:
+            if not saved_folders:
                 error_msg = "No questions were generated successfully"
-                if progress_callback:
-                    progress_callback(error_msg, "error", 100)
-                yield {"status": "error", "message": error_msg, "percentage": 100}
+                yield _report_progress(progress_callback, ProgressEvent("error", error_msg, 100))
                 return
             
-            if progress_callback:
-                progress_callback("Formatting quiz data...", "processing", 85)
-            yield {"status": "processing", "message": "Formatting quiz data...", "percentage": 85}
+            yield _report_progress(progress_callback, ProgressEvent("processing", "Formatting quiz data...", 85))
             
             # Create quiz metadata
             quiz_metadata = {
@@ -822,44 +1075,36 @@ class QuizWorkflowManager:
                 'repository': repo_key,
                 'course': course_name,
                 'chapters': [ch['chapter_id'] for ch in selected_chapters],
-                'question_count': len(all_questions),
+                'question_count': len(saved_folders),
                 'difficulty_distribution': {
-                    'easy': sum(1 for q in all_questions if q.get('difficulty') == 'easy'),
-                    'intermediate': sum(1 for q in all_questions if q.get('difficulty') == 'intermediate'),
-                    'hard': sum(1 for q in all_questions if q.get('difficulty') == 'hard')
+                    'easy': generated_counts['easy'],
+                    'intermediate': generated_counts['intermediate'],
+                    'hard': generated_counts['hard']
                 },
                 'generated_at': datetime.now().isoformat(),
                 'generator_version': '2.0.0'
             }
             
             # Questions already saved incrementally, no need to save again
-            if progress_callback:
-                progress_callback("All questions have been saved incrementally", "processing", 95)
-            
-            yield {
-                        "status": "warning",
-                        "message": error_msg,
-                        "percentage": 95
-                    }
+            yield _report_progress(progress_callback, ProgressEvent(
+                status="processing",
+                message="All questions have been saved incrementally",
+                percentage=95
+            ))
             
-            success_msg = f"Successfully generated {len(all_questions)} questions"
-            if progress_callback:
-                progress_callback(success_msg, "success", 100)
-            yield {
-                "status": "success",
-                "message": success_msg,
-                "percentage": 100,
-                "data": {
+            success_msg = f"Successfully generated {len(saved_folders)} questions"
+            yield _report_progress(progress_callback, ProgressEvent(
+                status="success",
+                message=success_msg,
+                percentage=100,
+                data={
                     "quiz_metadata": quiz_metadata,
-                    "questions_generated": len(all_questions),
+                    "questions_generated": len(saved_folders),
                     "saved_folders": saved_folders,
                     "repository_path": str(self._get_repo_path(repo_key) / 'courses' / course_name / 'quizz')
                 }
-            }
+            ))
             
         except Exception as e:
             error_msg = f"Quiz generation failed: {str(e)}"
-            if progress_callback:
-                progress_callback(error_msg, "error", 100)
-            yield {"status": "error", "message": error_msg, "percentage": 100}
-    
+            yield _report_progress(progress_callback, ProgressEvent("error", error_msg, 100))
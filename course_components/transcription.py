@@ -1,27 +1,64 @@
 from pathlib import Path
-from typing import Union, List, Optional, Tuple
-from dataclasses import dataclass, field
-from openai import OpenAI
+from typing import Union, List, Optional, Tuple, Iterator
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
+from openai import OpenAI, DefaultHttpxClient
 from dotenv import load_dotenv
 import os
 import tempfile
 import subprocess
 import math
+import json
+import hashlib
+import difflib
+import bisect
+import time
+from collections import deque
 import re
 
+try:
+    # httpx only speaks HTTP/2 when the optional h2 package is installed
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+load_dotenv()
+
+# Sentence-ending punctuation followed by whitespace and a capital letter
+_SENTENCE_END_RE = re.compile(r'([.!?]+)\s+(?=[A-Z])')
+# Fallback sentence break: a period followed by a space
+_PERIOD_BREAK_RE = re.compile(r'\. ')
+# "silence_end: 12.5 | silence_duration: 0.8" lines of ffmpeg's silencedetect filter
+_SILENCE_END_RE = re.compile(r'silence_end: (?P<end>[\d.]+) \| silence_duration: (?P<length>[\d.]+)')
+
+
+@lru_cache(maxsize=1)
+def _shared_client(api_key: str) -> OpenAI:
+    """Process-wide OpenAI client, so every TranscriptionService reuses one connection pool."""
+    # With HTTP/2 the parallel chunk uploads share one TLS connection as multiplexed streams
+    http_client = DefaultHttpxClient(http2=True) if _HTTP2_AVAILABLE else None
+    # The SDK backs off and retries 429/5xx responses itself; parallel chunk uploads hit them more often
+    return OpenAI(api_key=api_key, max_retries=TranscriptionService.API_MAX_RETRIES, http_client=http_client)
+
 
 @dataclass
 class TranscriptSegment:
     """A segment of transcript with timestamp information."""
+    # Long recordings produce thousands of segments; slots keep them compact
+    # (dataclass(slots=True) needs Python 3.10)
+    __slots__ = ('start', 'end', 'text')
+
     start: float  # Start time in seconds
     end: float    # End time in seconds
     text: str     # Segment text
     
     def format_timestamp(self) -> str:
         """Format start time as [HH:MM:SS]."""
-        hours = int(self.start // 3600)
-        minutes = int((self.start % 3600) // 60)
-        seconds = int(self.start % 60)
+        minutes, seconds = divmod(int(self.start), 60)
+        hours, minutes = divmod(minutes, 60)
         if hours > 0:
             return f"[{hours:02d}:{minutes:02d}:{seconds:02d}]"
         return f"[{minutes:02d}:{seconds:02d}]"
@@ -55,29 +92,111 @@ class TranscriptionResult:
         if not self.segments:
             return self.text
         
-        lines = []
+        # Drop the newline ending the last line
+        return ''.join(self.iter_with_timestamps())[:-1]
+    
+    def iter_with_timestamps(self) -> Iterator[str]:
+        """Yield the timestamped lines one at a time, newline included, e.g. for file.writelines()."""
         for segment in self.segments:
-            timestamp = segment.format_timestamp()
-            lines.append(f"{timestamp} {segment.text}")
-        return '\n'.join(lines)
+            yield f"{segment.format_timestamp()} {segment.text}\n"
+
+@dataclass(frozen=True)
+class AudioProbe:
+    """Audio stream parameters reported by ffprobe."""
+    duration: float          # Seconds
+    codec: Optional[str]     # e.g. 'mp3'
+    sample_rate: int         # Hz, 0 if unknown
+    channels: int            # 0 if unknown
+    bit_rate: int            # bits/s, 0 if unknown
+
+    def is_whisper_ready(self, max_bit_rate: int) -> bool:
+        """True when chunks can be stream-copied instead of re-encoded to 16 kHz mono mp3."""
+        return (
+            self.codec == 'mp3'
+            and self.channels == 1
+            and 0 < self.sample_rate <= 16000
+            and 0 < self.bit_rate <= max_bit_rate
+        )
+
+
+@lru_cache(maxsize=128)
+def _probe_audio_file(path: str, mtime_ns: int, size: int) -> AudioProbe:
+    """
+    Read duration and audio stream parameters with a single ffprobe call.
+
+    Memoized on (path, mtime_ns, size), so re-transcribing an unchanged file
+    (e.g. again with timestamps) does not start another ffprobe.
+    """
+    try:
+        result = subprocess.run([
+            'ffprobe', '-v', 'quiet', '-print_format', 'json',
+            '-show_format', '-show_streams', '-select_streams', 'a:0', path
+        ], capture_output=True, text=True, check=True)
+        info = json.loads(result.stdout)
+        streams = info.get('streams') or [{}]
+        stream = streams[0]
+        return AudioProbe(
+            duration=float(info['format']['duration']),
+            codec=stream.get('codec_name'),
+            sample_rate=int(stream.get('sample_rate') or 0),
+            channels=int(stream.get('channels') or 0),
+            bit_rate=int(stream.get('bit_rate') or info['format'].get('bit_rate') or 0)
+        )
+    except FileNotFoundError:
+        raise RuntimeError("ffprobe not found. Please install ffmpeg to enable audio chunking for large files.")
+    except (subprocess.CalledProcessError, ValueError, KeyError) as e:
+        raise RuntimeError(f"Failed to get audio duration: {e}")
+
 
 class TranscriptionService:
     """
     Service for transcribing audio files using OpenAI's Whisper API.
     Automatically chunks files larger than 25MB for processing.
     """
-    def __init__(self, model: str = "whisper-1", max_file_size_mb: int = 25) -> None:
+    API_MAX_RETRIES = 5
+    # Per-request timeout; a stalled upload times out and is retried by the SDK instead
+    # of waiting out the SDK's 10 minute default while the other chunks are done
+    API_TIMEOUT_SECONDS = 180
+    # Read size used when hashing audio files for the transcript cache
+    CACHE_READ_SIZE = 4 * 1024 * 1024
+    # Part of every cache key: bump whenever transcript formatting or chunk stitching changes,
+    # so entries written by older code are not served as hits
+    CACHE_FORMAT_VERSION = 1
+    # Buffer for the audio file handed to the SDK, so the multipart upload reads it in few large reads
+    UPLOAD_BUFFER_SIZE = 1024 * 1024
+    # Shortest time range an oversized chunk is split down to before giving up
+    MIN_CHUNK_SECONDS = 30
+    # Audio shared by consecutive chunks, and how many words at each seam are compared to remove it
+    OVERLAP_SECONDS = 1.0
+    OVERLAP_WINDOW_WORDS = 10
+    # Pause detection used by align_to_silence, and how far (fraction of a chunk) a boundary may move
+    SILENCE_THRESHOLD_DB = -30
+    SILENCE_MIN_SECONDS = 0.3
+    SILENCE_SEARCH_FRACTION = 0.1
+    # Per-chunk progress messages are sent at most this often (seconds); stage messages always go through
+    PROGRESS_MIN_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        model: str = "whisper-1",
+        max_file_size_mb: int = 25,
+        max_workers: int = 5,
+        cache_dir: Optional[Union[str, Path]] = None,
+        align_to_silence: bool = False
+    ) -> None:
         """
         Initializes the transcription service.
 
         Args:
             model: OpenAI Whisper model identifier.
             max_file_size_mb: Maximum file size in MB before chunking (default: 25).
+            max_workers: Chunks of a large file uploaded to Whisper at once (default: 5).
+            cache_dir: Folder for transcripts keyed by audio content hash; re-transcribing
+                an unchanged file is then served from disk (default: no cache).
+            align_to_silence: Move chunk boundaries of large files to nearby pauses, at the
+                cost of one extra decoding pass over the audio (default: False).
         """
-        # Load environment variables
-        load_dotenv()
-        
-        # Get API key from environment variables
+        # Get API key from environment variables (.env is loaded once at import)
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
@@ -85,105 +204,206 @@ class TranscriptionService:
         self.model = model
         self.max_file_size_mb = max_file_size_mb
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
-        self.client = OpenAI(api_key=api_key)
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.align_to_silence = align_to_silence
+        self.client = _shared_client(api_key)
 
-    def _get_audio_duration(self, audio_file: Path) -> float:
-        """Get audio duration in seconds using ffprobe."""
-        try:
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                '-of', 'csv=p=0', str(audio_file)
-            ], capture_output=True, text=True, check=True)
-            return float(result.stdout.strip())
-        except FileNotFoundError:
-            raise RuntimeError("ffprobe not found. Please install ffmpeg to enable audio chunking for large files.")
-        except (subprocess.CalledProcessError, ValueError) as e:
-            raise RuntimeError(f"Failed to get audio duration: {e}")
+    def _probe_audio(self, audio_file: Path) -> AudioProbe:
+        """Read duration and audio stream parameters, probing each file version only once."""
+        stat = audio_file.stat()
+        return _probe_audio_file(str(audio_file), stat.st_mtime_ns, stat.st_size)
 
     def _split_audio_into_chunks(
         self, 
         audio_file: Path, 
         temp_dir: Path, 
-        progress_callback=None,
-        include_offsets: bool = False
-    ) -> Union[List[Path], List[Tuple[Path, float]]]:
+        progress_callback=None
+    ) -> Iterator[Tuple[Path, float]]:
         """
         Split audio file into chunks that are under the size limit.
         
+        Chunks are encoded in parallel and yielded in order as soon as ffmpeg
+        has written them, so callers can start uploading a chunk while later
+        ones are still being encoded.
+        
         Args:
             audio_file: Path to the audio file
             temp_dir: Temporary directory to store chunks
             progress_callback: Optional callback for progress updates
-            include_offsets: If True, return tuples of (chunk_path, start_offset)
             
-        Returns:
-            If include_offsets is False: List of chunk file paths
-            If include_offsets is True: List of (chunk_path, start_offset_seconds) tuples
+        Yields:
+            (chunk_path, start_offset_seconds) tuples, in order
         """
-        duration = self._get_audio_duration(audio_file)
+        probe = self._probe_audio(audio_file)
+        duration = probe.duration
+
+        # Whisper-ready mp3 (mono, <= 16 kHz, <= 128 kbps) is cut without re-encoding
+        stream_copy = probe.is_whisper_ready(128 * 1000)
 
-        # Calculate max chunk duration based on target bitrate (128 kbps)
-        # 128 kbps = 16 KB/s, with 80% safety margin for 25 MB limit
+        # Calculate max chunk duration from the bitrate the chunks will actually have:
+        # 128 kbps when re-encoding, the source's own (lower) bitrate when copying,
+        # with 80% safety margin for the size limit
         target_size_mb = self.max_file_size_mb * 0.8  # 20 MB target
-        bitrate_kbps = 128
+        bitrate_kbps = probe.bit_rate / 1000 if stream_copy else 128
         max_chunk_duration = (target_size_mb * 1024 * 8) / bitrate_kbps  # seconds
 
         # Calculate number of chunks needed
         num_chunks = math.ceil(duration / max_chunk_duration)
         chunk_duration = duration / num_chunks
-        
+
+        # Chunk i covers boundaries[i]..boundaries[i+1]; inner boundaries can move to a pause
+        boundaries = [i * chunk_duration for i in range(num_chunks)] + [duration]
+        on_silence = [False] * (num_chunks + 1)
+        if self.align_to_silence and num_chunks > 1:
+            if progress_callback:
+                progress_callback("Looking for pauses to place chunk boundaries...")
+            silences = self._find_silences(audio_file)
+            max_shift = chunk_duration * self.SILENCE_SEARCH_FRACTION
+            for i in range(1, num_chunks):
+                pause = self._nearest(silences, boundaries[i])
+                if pause is not None and abs(pause - boundaries[i]) <= max_shift:
+                    boundaries[i] = pause
+                    on_silence[i] = True
+
         if progress_callback:
-            progress_callback(f"Splitting audio into {num_chunks} chunks (~{chunk_duration:.1f}s each)...")
-
-        chunk_files = []
-        for i in range(num_chunks):
-            start_time = i * chunk_duration
-            # Always use .mp3 for chunks since we're re-encoding
-            chunk_file = temp_dir / f"chunk_{i:03d}.mp3"
-
-            # Use ffmpeg to extract chunk with re-encoding for compatibility
-            # We re-encode to ensure compatibility across all formats
-            cmd = [
-                'ffmpeg', '-i', str(audio_file),
-                '-ss', str(start_time),
-                '-t', str(chunk_duration),
+            mode = "copying stream" if stream_copy else "re-encoding"
+            progress_callback(f"Splitting audio into {num_chunks} chunks (~{chunk_duration:.1f}s each, {mode})...")
+
+        # Chunks cover independent time ranges, so several ffmpeg processes encode
+        # at once (one encoder thread each); chunks are still yielded in order
+        encode_workers = min(num_chunks, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=encode_workers) as executor:
+            # Chunks after the first start OVERLAP_SECONDS early unless they start in a pause,
+            # so words cut at a boundary are heard whole by one side; transcribe drops the repeats
+            starts = [
+                boundaries[i] if i == 0 or on_silence[i] else max(0.0, boundaries[i] - self.OVERLAP_SECONDS)
+                for i in range(num_chunks)
+            ]
+
+            def submit(i: int):
+                return executor.submit(
+                    self._encode_chunk, audio_file, temp_dir / f"chunk_{i:03d}.mp3",
+                    starts[i], boundaries[i + 1] - starts[i], stream_copy
+                )
+
+            # Only keep one chunk per worker in progress, so encoding stays just ahead
+            # of the consumer instead of filling the temp folder with the whole file
+            next_index = encode_workers
+            encoding = deque(submit(i) for i in range(next_index))
+            last_progress_time = float('-inf')
+            for i in range(num_chunks):
+                pieces = encoding.popleft().result()
+                if next_index < num_chunks:
+                    encoding.append(submit(next_index))
+                    next_index += 1
+
+                now = time.monotonic()
+                if progress_callback and (
+                    i == num_chunks - 1 or now - last_progress_time >= self.PROGRESS_MIN_INTERVAL
+                ):
+                    last_progress_time = now
+                    chunk_size = sum(size for _, _, size in pieces)
+                    split_note = f", split in {len(pieces)} to fit the limit" if len(pieces) > 1 else ""
+                    progress_callback(f"Created chunk {i+1}/{num_chunks} ({chunk_size / (1024 * 1024):.1f} MB{split_note})")
+
+                # Start time is kept for timestamp adjustment
+                for chunk_file, start_time, _ in pieces:
+                    yield chunk_file, start_time
+
+    def _find_silences(self, audio_file: Path) -> List[float]:
+        """Midpoints (seconds) of the pauses ffmpeg's silencedetect finds in the audio, in order."""
+        cmd = [
+            'ffmpeg', '-nostats', '-i', str(audio_file),
+            '-af', f'silencedetect=n={self.SILENCE_THRESHOLD_DB}dB:d={self.SILENCE_MIN_SECONDS}',
+            '-f', 'null', '-'
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, check=True, text=True)
+        except FileNotFoundError:
+            raise RuntimeError("ffmpeg not found. Please install ffmpeg to enable audio chunking for large files.")
+        except subprocess.CalledProcessError:
+            # Pauses only improve boundaries; fall back to fixed cuts
+            return []
+
+        return [
+            float(match.group('end')) - float(match.group('length')) / 2
+            for match in _SILENCE_END_RE.finditer(result.stderr)
+        ]
+
+    def _nearest(self, sorted_times: List[float], target: float) -> Optional[float]:
+        """Value of sorted_times closest to target, or None when the list is empty."""
+        index = bisect.bisect_left(sorted_times, target)
+        candidates = sorted_times[max(0, index - 1):index + 1]
+        return min(candidates, key=lambda t: abs(t - target), default=None)
+
+    def _encode_chunk(
+        self,
+        audio_file: Path,
+        chunk_file: Path,
+        start_time: float,
+        chunk_duration: float,
+        stream_copy: bool = False
+    ) -> List[Tuple[Path, float, int]]:
+        """
+        Extract one time range of the audio file with ffmpeg.
+
+        The range is re-encoded to 16 kHz mono mp3, or copied as-is when
+        stream_copy is set (source already in that format). A range that comes
+        out over the size limit (e.g. a variable-bitrate source denser than its
+        average) is cut in two halves, recursively.
+
+        Returns:
+            (chunk_path, start_offset_seconds, size_in_bytes) for each file, in order
+        """
+        # -ss before -i seeks the input instead of decoding everything up to start_time,
+        # so each chunk only decodes its own time range (still frame-accurate when re-encoding)
+        # Only errors are logged: stderr is read solely to explain a failure
+        cmd = ['ffmpeg', '-v', 'error', '-ss', str(start_time), '-i', str(audio_file), '-t', str(chunk_duration)]
+        if stream_copy:
+            # mp3 frames are independent, so copying cuts cleanly with no decode/encode
+            cmd += ['-map', '0:a', '-c:a', 'copy']
+        else:
+            # Re-encode to ensure compatibility across all formats
+            cmd += [
                 '-acodec', 'libmp3lame',  # Re-encode to mp3 for universal compatibility
                 '-ab', '128k',  # Reasonable bitrate for transcription
                 '-ar', '16000',  # Whisper API works well with 16kHz
                 '-ac', '1',  # Mono audio for smaller size
-                '-y', str(chunk_file)
+                '-threads', '1',  # Chunks are encoded in parallel, don't oversubscribe cores
             ]
+        cmd += ['-y', str(chunk_file)]
 
-            try:
-                subprocess.run(cmd, capture_output=True, check=True, text=True)
-
-                # Verify chunk size is under limit
-                chunk_size = chunk_file.stat().st_size
-                if chunk_size > self.max_file_size_bytes:
-                    raise RuntimeError(
-                        f"Chunk {i+1} is {chunk_size / (1024 * 1024):.1f} MB, "
-                        f"exceeds {self.max_file_size_mb} MB limit. Try reducing audio quality further."
-                    )
-
-                # Include offset if requested (for timestamp adjustment)
-                if include_offsets:
-                    chunk_files.append((chunk_file, start_time))
-                else:
-                    chunk_files.append(chunk_file)
-
-                if progress_callback:
-                    progress_callback(f"Created chunk {i+1}/{num_chunks} ({chunk_size / (1024 * 1024):.1f} MB)")
-
-            except FileNotFoundError:
-                raise RuntimeError("ffmpeg not found. Please install ffmpeg to enable audio chunking for large files.")
-            except subprocess.CalledProcessError as e:
-                # Provide more detailed error information
-                error_msg = f"Failed to create chunk {i+1}"
-                if e.stderr:
-                    error_msg += f": {e.stderr}"
-                raise RuntimeError(error_msg)
-        
-        return chunk_files
+        try:
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+        except FileNotFoundError:
+            raise RuntimeError("ffmpeg not found. Please install ffmpeg to enable audio chunking for large files.")
+        except subprocess.CalledProcessError as e:
+            # Provide more detailed error information
+            error_msg = f"Failed to create {chunk_file.name}"
+            if e.stderr:
+                error_msg += f": {e.stderr.decode('utf-8', 'replace').strip()}"
+            raise RuntimeError(error_msg)
+
+        # Verify chunk size is under limit
+        chunk_size = chunk_file.stat().st_size
+        if chunk_size <= self.max_file_size_bytes:
+            return [(chunk_file, start_time, chunk_size)]
+
+        if chunk_duration < self.MIN_CHUNK_SECONDS:
+            raise RuntimeError(
+                f"{chunk_file.name} is {chunk_size / (1024 * 1024):.1f} MB, "
+                f"exceeds {self.max_file_size_mb} MB limit. Try reducing audio quality further."
+            )
+
+        chunk_file.unlink()
+        half = chunk_duration / 2
+        return (
+            self._encode_chunk(audio_file, chunk_file.with_name(f"{chunk_file.stem}a.mp3"),
+                               start_time, half, stream_copy)
+            + self._encode_chunk(audio_file, chunk_file.with_name(f"{chunk_file.stem}b.mp3"),
+                                 start_time + half - self.OVERLAP_SECONDS, half + self.OVERLAP_SECONDS, stream_copy)
+        )
 
     def _transcribe_single_file(
         self, 
@@ -206,30 +426,28 @@ class TranscriptionService:
             If include_timestamps is True: tuple of (text, list of TranscriptSegment)
         """
         try:
-            with open(audio_file, "rb") as audio:
+            with open(audio_file, "rb", buffering=self.UPLOAD_BUFFER_SIZE) as audio:
                 if include_timestamps:
                     # Use verbose_json to get segment timestamps
                     response = self.client.audio.transcriptions.create(
                         model=self.model,
                         file=audio,
-                        response_format="verbose_json"
+                        response_format="verbose_json",
+                        timeout=self.API_TIMEOUT_SECONDS
                     )
                     
                     # Extract segments with timestamps
-                    segments = []
-                    for seg in response.segments:
-                        segment = TranscriptSegment(
-                            start=seg.start + time_offset,
-                            end=seg.end + time_offset,
-                            text=seg.text.strip()
-                        )
-                        segments.append(segment)
+                    segments = [
+                        TranscriptSegment(start=seg.start + time_offset, end=seg.end + time_offset, text=seg.text.strip())
+                        for seg in response.segments
+                    ]
                     
                     return response.text, segments
                 else:
                     response = self.client.audio.transcriptions.create(
                         model=self.model,
-                        file=audio
+                        file=audio,
+                        timeout=self.API_TIMEOUT_SECONDS
                     )
                     return response.text
         except Exception as e:
@@ -251,54 +469,91 @@ class TranscriptionService:
         # Clean up the transcript
         text = transcript.strip()
         
-        # First, try to split on sentence boundaries with proper punctuation
-        # This pattern matches sentence-ending punctuation followed by whitespace and a capital letter
-        sentence_endings = r'([.!?]+)\s+(?=[A-Z])'
-        
-        # Split and keep the delimiters
-        parts = re.split(sentence_endings, text)
+        # Breaks need punctuation followed by more text: without any before the last
+        # character (short clips, titles, a single sentence) there is nothing to split
+        end = len(text) - 1
+        if text.find('.', 0, end) < 0 and text.find('!', 0, end) < 0 and text.find('?', 0, end) < 0:
+            return text
         
+        # First, try to split on sentence boundaries with proper punctuation:
+        # each sentence runs up to and including its ending punctuation
         sentences = []
-        i = 0
-        while i < len(parts):
-            if i + 1 < len(parts) and re.match(r'^[.!?]+$', parts[i + 1]):
-                # Current part + punctuation
-                sentence = parts[i] + parts[i + 1]
-                i += 2
-            else:
-                sentence = parts[i]
-                i += 1
-            
-            sentence = sentence.strip()
+        last = 0
+        for match in _SENTENCE_END_RE.finditer(text):
+            sentence = text[last:match.end(1)].strip()
             if sentence:
                 sentences.append(sentence)
+            last = match.end()
+        tail = text[last:].strip()
+        if tail:
+            sentences.append(tail)
         
         # If we didn't get good sentence breaks, try simpler approaches
         if len(sentences) <= 1:
-            # Fall back to splitting on periods followed by space
-            if '. ' in text:
-                parts = text.split('. ')
-                sentences = []
-                for i, part in enumerate(parts):
-                    part = part.strip()
-                    if part:
-                        # Add period back except for the last part (which may already have ending punctuation)
-                        if i < len(parts) - 1 and not part.endswith(('.', '!', '?')):
-                            part += '.'
-                        sentences.append(part)
-            else:
-                # If no good sentence breaks, keep as single block but clean it up
-                sentences = [text]
+            # Fall back to splitting on periods followed by space; without any,
+            # the whole text ends up as a single block
+            sentences = []
+            last = 0
+            for match in _PERIOD_BREAK_RE.finditer(text):
+                part = text[last:match.start()].strip()
+                if part:
+                    # Add the period back (the last part keeps whatever ending punctuation it has)
+                    sentences.append(part if part[-1] in '.!?' else part + '.')
+                last = match.end()
+            tail = text[last:].strip()
+            if tail:
+                sentences.append(tail)
         
-        # Clean up sentences and remove empty ones
-        cleaned_sentences = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 1:  # Avoid single character lines
-                cleaned_sentences.append(sentence)
+        # Join sentences with newlines, leaving out single character lines
+        # (sentences are already stripped and non-empty)
+        return '\n'.join(sentence for sentence in sentences if len(sentence) > 1) or text
+
+    def _overlap_word_count(self, previous_text: str, text: str) -> int:
+        """
+        Count the leading words of text that repeat the end of previous_text.
+        
+        Consecutive chunks share OVERLAP_SECONDS of audio, so a few words are
+        transcribed twice. The longest common run between the previous tail and
+        this head is taken as the overlap when it closes the previous chunk and
+        opens this one (allowing a couple of words cut mid-way on either side).
+        """
+        if not previous_text:
+            return 0
         
-        # Join sentences with newlines
-        return '\n'.join(cleaned_sentences) if cleaned_sentences else text
+        window = self.OVERLAP_WINDOW_WORDS
+
+        def normalize(word: str) -> str:
+            return word.strip('.,!?;:"\'').lower()
+
+        tail = [normalize(word) for word in previous_text.rsplit(None, window)[-window:]]
+        head = [normalize(word) for word in text.split(None, window)[:window]]
+        
+        match = difflib.SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(0, len(tail), 0, len(head))
+        closes_previous = match.a + match.size >= len(tail) - 2
+        # A two-word run only counts right at the start; skipping a cut word needs a longer run
+        opens_this = (match.b == 0 and match.size >= 2) or (match.b <= 2 and match.size >= 3)
+        if closes_previous and opens_this:
+            return match.b + match.size
+        return 0
+
+    def _drop_leading_words(self, text: str, count: int) -> str:
+        """Remove the first count words of text."""
+        parts = text.split(None, count)
+        return parts[count] if len(parts) > count else ''
+
+    def _drop_leading_segment_words(self, segments: List[TranscriptSegment], count: int) -> List[TranscriptSegment]:
+        """Remove the first count words across segments, dropping segments that end up empty."""
+        trimmed = []
+        for segment in segments:
+            if count:
+                words = len(segment.text.split())
+                if words <= count:
+                    count -= words
+                    continue
+                segment = TranscriptSegment(segment.start, segment.end, self._drop_leading_words(segment.text, count))
+                count = 0
+            trimmed.append(segment)
+        return trimmed
 
     def _format_transcript_with_timestamps(
         self, 
@@ -330,18 +585,11 @@ class TranscriptionService:
         # Strategy: Find where each sentence starts in the original segments
         sentence_segments = []
         
-        # Build a character-to-timestamp mapping from segments
-        char_timestamps = []  # List of (char_position, timestamp)
-        current_pos = 0
-        
-        for seg in segments:
-            # Record the start position and timestamp
-            char_timestamps.append((current_pos, seg.start, seg.end))
-            current_pos += len(seg.text) + 1  # +1 for space between segments
+        # Start character of each segment in full_text (segments are joined by one space)
+        seg_offsets = list(accumulate((len(seg.text) + 1 for seg in segments[:-1]), initial=0))
         
         # For each sentence, find its approximate start timestamp
         search_pos = 0
-        combined_for_search = " ".join(seg.text for seg in segments)
         
         for sentence in sentences:
             if not sentence.strip():
@@ -352,37 +600,23 @@ class TranscriptionService:
             search_text = sentence[:min(50, len(sentence))].strip()
             
             # Find position in combined text
-            found_pos = combined_for_search.find(search_text, search_pos)
+            found_pos = full_text.find(search_text, search_pos)
             if found_pos == -1:
                 # Fallback: try with less text
                 search_text = sentence[:min(20, len(sentence))].strip()
-                found_pos = combined_for_search.find(search_text, search_pos)
+                found_pos = full_text.find(search_text, search_pos)
             
             if found_pos == -1:
                 found_pos = search_pos  # Use current position as fallback
             
-            # Find the timestamp for this position
-            start_time = 0.0
-            end_time = segments[-1].end if segments else 0.0
-            
-            for i, (char_pos, seg_start, seg_end) in enumerate(char_timestamps):
-                if char_pos <= found_pos:
-                    start_time = seg_start
-                    # Find the end time from the segment where the sentence likely ends
-                    sentence_end_pos = found_pos + len(sentence)
-                    for j in range(i, len(char_timestamps)):
-                        if j + 1 < len(char_timestamps):
-                            if char_timestamps[j + 1][0] > sentence_end_pos:
-                                end_time = char_timestamps[j][2]
-                                break
-                        else:
-                            end_time = char_timestamps[j][2]
-                else:
-                    break
+            # The sentence starts in the last segment starting at or before found_pos
+            # and ends in the last segment starting at or before its final character
+            first = bisect.bisect_right(seg_offsets, found_pos) - 1
+            last = bisect.bisect_right(seg_offsets, found_pos + len(sentence)) - 1
             
             sentence_segments.append(TranscriptSegment(
-                start=start_time,
-                end=end_time,
+                start=segments[first].start,
+                end=segments[last].end,
                 text=sentence.strip()
             ))
             
@@ -418,6 +652,88 @@ class TranscriptionService:
         if not audio_path.exists():
             raise ValueError(f"Audio file not found: {audio_file}")
 
+        cache_file = self._cache_file(audio_path, include_timestamps)
+        if cache_file:
+            cached = self._load_cached_transcript(cache_file, include_timestamps)
+            if cached is not None:
+                if progress_callback:
+                    progress_callback("Using cached transcript (audio unchanged since last transcription)")
+                return cached
+
+        result = self._transcribe_uncached(audio_path, progress_callback, include_timestamps)
+        if cache_file:
+            self._store_cached_transcript(cache_file, result)
+        return result
+
+    def _cache_file(self, audio_path: Path, include_timestamps: bool) -> Optional[Path]:
+        """Transcript cache location for this audio content and these settings, or None when caching is off."""
+        if not self.cache_dir:
+            return None
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(audio_path, 'rb') as f:
+            for block in iter(lambda: f.read(self.CACHE_READ_SIZE), b''):
+                digest.update(block)
+        # Settings that change the transcript output are part of the key: chunk
+        # boundaries, seam overlap and dedupe, and the formatting version
+        settings = (
+            self.CACHE_FORMAT_VERSION, self.model, self.max_file_size_mb, self.MIN_CHUNK_SECONDS,
+            self.OVERLAP_SECONDS, self.OVERLAP_WINDOW_WORDS, self.align_to_silence,
+            self.SILENCE_THRESHOLD_DB, self.SILENCE_MIN_SECONDS, self.SILENCE_SEARCH_FRACTION
+        )
+        digest.update('|'.join(map(str, settings)).encode())
+
+        suffix = '.json' if include_timestamps else '.txt'
+        return self.cache_dir / f"{digest.hexdigest()}{suffix}"
+
+    def _load_cached_transcript(
+        self,
+        cache_file: Path,
+        include_timestamps: bool
+    ) -> Optional[Union[str, TranscriptionResult]]:
+        """Read a cached transcript; None on a miss or an unreadable entry."""
+        try:
+            if not include_timestamps:
+                return cache_file.read_text(encoding='utf-8')
+
+            data = json.loads(cache_file.read_text(encoding='utf-8'))
+            return TranscriptionResult(
+                text=data['text'],
+                segments=[TranscriptSegment(**segment) for segment in data['segments']],
+                duration=data.get('duration'),
+                language=data.get('language')
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  Ignoring unreadable transcript cache entry {cache_file.name}: {e}")
+            return None
+
+    def _store_cached_transcript(self, cache_file: Path, result: Union[str, TranscriptionResult]) -> None:
+        """Write a transcript to the cache via a temp file and os.replace, so readers never see a partial entry."""
+        text = json.dumps(asdict(result), ensure_ascii=False) if isinstance(result, TranscriptionResult) else result
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # A unique temp name, so concurrent writers of the same entry don't share one
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{cache_file.name}.", suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+                    tmp_file.write(text)
+                os.replace(tmp_name, cache_file)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError as e:
+            # The transcript itself succeeded; a cache write failure should not lose it
+            print(f"⚠️  Could not write transcript cache entry {cache_file.name}: {e}")
+
+    def _transcribe_uncached(
+        self,
+        audio_path: Path,
+        progress_callback=None,
+        include_timestamps: bool = False
+    ) -> Union[str, TranscriptionResult]:
+        """Transcribe an existing audio file through the Whisper API (see transcribe)."""
         # Get file size for progress indication
         file_size = audio_path.stat().st_size
         file_size_mb = file_size / (1024 * 1024)
@@ -462,7 +778,7 @@ class TranscriptionService:
 
                     if progress_callback:
                         word_count = len(transcript.split())
-                        sentence_count = len(formatted_transcript.split('\n'))
+                        sentence_count = formatted_transcript.count('\n') + 1
                         progress_callback(f"Transcription completed ({word_count} words, {sentence_count} sentences)")
                     
                     return formatted_transcript
@@ -481,35 +797,73 @@ class TranscriptionService:
                 with tempfile.TemporaryDirectory() as temp_dir:
                     temp_path = Path(temp_dir)
 
-                    if include_timestamps:
-                        # Split audio into chunks WITH offset tracking
-                        chunk_data = self._split_audio_into_chunks(
-                            audio_path, temp_path, progress_callback, include_offsets=True
-                        )
-
-                        # Transcribe each chunk with timestamp offset adjustment
-                        all_segments = []
-                        total_words = 0
-
-                        if progress_callback:
-                            progress_callback(f"Transcribing {len(chunk_data)} chunks with timestamps...")
-
-                        for i, (chunk_file, time_offset) in enumerate(chunk_data, 1):
-                            if progress_callback:
-                                progress_callback(f"Uploading chunk {i}/{len(chunk_data)} to OpenAI...")
-
-                            chunk_text, chunk_segments = self._transcribe_single_file(
-                                chunk_file, progress_callback, 
-                                include_timestamps=True, 
-                                time_offset=time_offset
-                            )
-                            all_segments.extend(chunk_segments)
-
-                            chunk_words = len(chunk_text.split())
-                            total_words += chunk_words
+                    if progress_callback:
+                        progress_callback(f"Transcribing chunks as they are created "
+                                          f"(up to {self.max_workers} uploads at a time)...")
+
+                    # Chunks are independent requests: each one is uploaded as soon as ffmpeg
+                    # has written it, overlapping encoding with the uploads of earlier chunks.
+                    # At most max_workers uploads are outstanding, so chunks are only encoded as
+                    # fast as they are consumed; results are handled in chunk order so text and
+                    # offsets line up, and each chunk file is deleted once transcribed.
+                    chunk_results = []
+                    total_words = 0
+                    previous_text = ''
+                    completed = 0
+                    last_progress_time = float('-inf')
+                    pending = deque()
+                    chunks = self._split_audio_into_chunks(audio_path, temp_path, progress_callback)
+                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                        try:
+                            while True:
+                                next_chunk = next(chunks, None) if len(pending) < self.max_workers else None
+                                if next_chunk is not None:
+                                    chunk_file, time_offset = next_chunk
+                                    pending.append((chunk_file, executor.submit(
+                                        self._transcribe_single_file, chunk_file, progress_callback,
+                                        include_timestamps=include_timestamps,
+                                        time_offset=time_offset
+                                    )))
+                                    continue
+                                if not pending:
+                                    break
+
+                                chunk_file, future = pending.popleft()
+                                chunk_result = future.result()
+                                chunk_file.unlink(missing_ok=True)
+                                completed += 1
+                                chunk_text = chunk_result[0] if include_timestamps else chunk_result
+
+                                # Chunks overlap by OVERLAP_SECONDS: drop the words this one repeats
+                                # from the end of the previous chunk
+                                repeated_words = self._overlap_word_count(previous_text, chunk_text)
+                                previous_text = chunk_text
+                                if repeated_words:
+                                    chunk_text = self._drop_leading_words(chunk_text, repeated_words)
+                                    if include_timestamps:
+                                        chunk_result = (chunk_text, self._drop_leading_segment_words(chunk_result[1], repeated_words))
+
+                                chunk_results.append(chunk_result if include_timestamps else chunk_text)
+
+                                # Word counts only feed progress messages, so skip them when nobody listens
+                                if progress_callback:
+                                    chunk_words = len(chunk_text.split())
+                                    total_words += chunk_words
+                                    now = time.monotonic()
+                                    if now - last_progress_time >= self.PROGRESS_MIN_INTERVAL:
+                                        last_progress_time = now
+                                        progress_callback(f"Chunk {completed} completed ({chunk_words} words)")
+                        except Exception:
+                            # One failed chunk fails the transcript: don't start the remaining uploads
+                            # and stop encoding further chunks
+                            for _, queued in pending:
+                                queued.cancel()
+                            chunks.close()
+                            raise
 
-                            if progress_callback:
-                                progress_callback(f"Chunk {i}/{len(chunk_data)} completed ({chunk_words} words)")
+                    if include_timestamps:
+                        # Transcribed segments already carry their chunk's time offset
+                        all_segments = [segment for _, chunk_segments in chunk_results for segment in chunk_segments]
 
                         # Format into sentences with aligned timestamps
                         formatted_text, sentence_segments = self._format_transcript_with_timestamps(all_segments)
@@ -524,37 +878,14 @@ class TranscriptionService:
                             duration=all_segments[-1].end if all_segments else None
                         )
                     else:
-                        # Original logic without timestamps
-                        chunk_files = self._split_audio_into_chunks(audio_path, temp_path, progress_callback)
-
-                        # Transcribe each chunk
-                        transcripts = []
-                        total_words = 0
-
-                        if progress_callback:
-                            progress_callback(f"Transcribing {len(chunk_files)} chunks...")
-
-                        for i, chunk_file in enumerate(chunk_files, 1):
-                            if progress_callback:
-                                progress_callback(f"Uploading chunk {i}/{len(chunk_files)} to OpenAI...")
-
-                            chunk_transcript = self._transcribe_single_file(chunk_file, progress_callback)
-                            transcripts.append(chunk_transcript)
-
-                            chunk_words = len(chunk_transcript.split())
-                            total_words += chunk_words
-
-                            if progress_callback:
-                                progress_callback(f"Chunk {i}/{len(chunk_files)} completed ({chunk_words} words)")
-
                         # Combine all transcripts with spaces between chunks
-                        full_transcript = " ".join(transcripts)
+                        full_transcript = " ".join(chunk_results)
 
                         # Format the combined transcript for better readability
                         formatted_transcript = self._format_transcript(full_transcript)
 
                         if progress_callback:
-                            sentence_count = len(formatted_transcript.split('\n'))
+                            sentence_count = formatted_transcript.count('\n') + 1
                             progress_callback(f"All chunks transcribed and combined ({total_words} words, {sentence_count} sentences)")
 
                         return formatted_transcript
@@ -3,8 +3,12 @@ Utility functions for Course Ally
 """
 
 import re
+from functools import lru_cache
 from typing import Tuple, Optional
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, unquote_plus
+
+# Hosts accepted as YouTube URLs
+_YOUTUBE_HOSTS = frozenset({'www.youtube.com', 'youtube.com', 'youtu.be', 'm.youtube.com'})
 
 def detect_youtube_url_type(url: str) -> Tuple[str, Optional[str]]:
     """
@@ -35,33 +39,43 @@ def detect_youtube_url_type(url: str) -> Tuple[str, Optional[str]]:
         return ('invalid', None)
     
     # Clean up the URL
-    url = url.strip()
-    
+    return _detect_stripped_youtube_url_type(url.strip())
+
+def _query_value(query: str, key: str) -> Optional[str]:
+    """First non-blank value of key in a URL query string, decoded the way parse_qs decodes it."""
+    for param in query.split('&'):
+        name, has_value, value = param.partition('=')
+        if has_value and value and unquote_plus(name) == key:
+            return unquote_plus(value)
+    return None
+
+@lru_cache(maxsize=4096)
+def _detect_stripped_youtube_url_type(url: str) -> Tuple[str, Optional[str]]:
+    """Classify a stripped URL; cached since the is_*/extract helpers each re-classify the same URL."""
     try:
         parsed = urlparse(url)
         
         # Check if it's a YouTube domain
-        if parsed.netloc not in ['www.youtube.com', 'youtube.com', 'youtu.be', 'm.youtube.com']:
+        if parsed.netloc not in _YOUTUBE_HOSTS:
             return ('invalid', None)
         
-        # Parse query parameters
-        query_params = parse_qs(parsed.query)
-        
+        # Only two query parameters matter, so look them up instead of parsing them all
         # Check for playlist indicators
-        if 'list' in query_params:
+        if _query_value(parsed.query, 'list') is not None:
             # It's a playlist URL
             return ('playlist', url)
         
         # Check for video indicators
+        video_param = _query_value(parsed.query, 'v')
         if parsed.netloc == 'youtu.be':
             # Short URL format: https://youtu.be/VIDEO_ID
             video_id = parsed.path.lstrip('/')
             if video_id and len(video_id) == 11:  # YouTube video IDs are 11 characters
                 return ('video', video_id)
         
-        elif 'v' in query_params:
+        elif video_param is not None:
             # Standard format: https://www.youtube.com/watch?v=VIDEO_ID
-            video_id = query_params['v'][0]
+            video_id = video_param
             if video_id and len(video_id) == 11:
                 return ('video', video_id)
         
@@ -7,11 +7,10 @@ def interactive_menu() -> None:
     """
     Interactive menu to select and run available CLI features.
     """
-    commands = list(cli.commands.keys())
+    commands = list(cli.commands.items())
     
     print("Available features:")
-    for idx, name in enumerate(commands, start=1):
-        cmd = cli.commands[name]
+    for idx, (name, cmd) in enumerate(commands, start=1):
         help_text = cmd.help or ''
         print(f"{idx}. {name} - {help_text}")
     
@@ -26,7 +25,7 @@ def interactive_menu() -> None:
         print("Invalid choice.")
         sys.exit(1)
     
-    cmd_name = commands[sel - 1]
+    cmd_name, _ = commands[sel - 1]
     
     if cmd_name == 'playlist-to-md':
         # Collect command arguments
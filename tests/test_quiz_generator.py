@@ -0,0 +1,58 @@
+"""Tests for reading and writing saved quiz questions"""
+
+import os
+import stat
+
+import pytest
+
+from course_components.quiz_generator import QuizGenerator, _write_text_atomic
+
+
+class FakeClient:
+    def with_options(self, **options):
+        return self
+
+
+@pytest.fixture
+def generator():
+    return QuizGenerator(client=FakeClient())
+
+
+def _write_question(quizz_path, folder, question_line, chapter_id='ch-1', difficulty='easy'):
+    quiz_dir = quizz_path / folder
+    quiz_dir.mkdir(parents=True)
+    (quiz_dir / 'question.yml').write_text(f"chapterId: {chapter_id}\ndifficulty: {difficulty}\n", encoding='utf-8')
+    (quiz_dir / 'en.yml').write_text(f"{question_line}\nanswer: a\n", encoding='utf-8')
+
+
+def test_existing_questions_unquote_yaml_and_keep_raw_text(generator, tmp_path):
+    _write_question(tmp_path, '001', "question: 'What is a block?'")
+    _write_question(tmp_path, '002', 'question: "A \\"quoted\\" word"')
+    # Written as raw text by older versions: starts with a quote but is not a YAML scalar
+    _write_question(tmp_path, '003', 'question: "Why" is the sky blue?', difficulty='hard')
+    _write_question(tmp_path, '004', 'question: Other chapter?', chapter_id='ch-2')
+
+    questions = generator._load_existing_questions_for_chapter(tmp_path, 'ch-1')
+
+    assert sorted(questions, key=lambda q: q['question']) == [
+        {'question': '"Why" is the sky blue?', 'difficulty': 'hard'},
+        {'question': 'A "quoted" word', 'difficulty': 'easy'},
+        {'question': 'What is a block?', 'difficulty': 'easy'},
+    ]
+
+
+def test_atomic_write_uses_regular_file_mode(tmp_path):
+    umask = os.umask(0o022)
+    os.umask(umask)
+    new_file = tmp_path / 'question.yml'
+    _write_text_atomic(str(new_file), 'id: 1\n')
+    assert new_file.read_text() == 'id: 1\n'
+    assert stat.S_IMODE(new_file.stat().st_mode) == 0o666 & ~umask
+
+    existing = tmp_path / 'en.yml'
+    existing.write_text('old\n')
+    existing.chmod(0o640)
+    _write_text_atomic(str(existing), 'new\n')
+    assert existing.read_text() == 'new\n'
+    assert stat.S_IMODE(existing.stat().st_mode) == 0o640
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['en.yml', 'question.yml']
@@ -0,0 +1,372 @@
+"""Tests for chapter parsing, difficulty balancing and quiz generation"""
+
+import json
+import threading
+from collections import Counter
+from fractions import Fraction
+from types import SimpleNamespace
+
+import anthropic
+import pytest
+
+from course_components import quiz_generator, quiz_workflow
+from course_components.quiz_workflow import (
+    QuizWorkflowManager,
+    _difficulty_distribution,
+    _parse_chapters,
+)
+
+
+def _line_loop_chapters(content):
+    """The original nested line loop, kept as the reference for _parse_chapters"""
+    chapters = []
+    lines = content.split('\n')
+    for i, line in enumerate(lines):
+        if not line.startswith('## '):
+            continue
+        title = line[3:].strip()
+        chapter_id = None
+        chapter_id_line = None
+        for j in range(i + 1, min(i + 6, len(lines))):
+            if '<chapterId>' in lines[j] and '</chapterId>' in lines[j]:
+                start = lines[j].find('<chapterId>') + len('<chapterId>')
+                end = lines[j].find('</chapterId>')
+                chapter_id = lines[j][start:end].strip()
+                chapter_id_line = j
+                break
+        if chapter_id and chapter_id_line:
+            content_end = len(lines)
+            for k in range(chapter_id_line + 1, len(lines)):
+                if lines[k].startswith('## '):
+                    content_end = k
+                    break
+            chapters.append((title, chapter_id, '\n'.join(lines[chapter_id_line:content_end]).strip()))
+    return chapters
+
+
+def _regex_chapters(content):
+    return [(title, chapter_id, content[start:end].strip())
+            for title, chapter_id, start, end in _parse_chapters(content)]
+
+
+CHAPTER_DOCUMENTS = [
+    "",
+    "# Course\n\nNo chapters here.\n",
+    "## Intro\n<chapterId>intro-1</chapterId>\nSome text.\n",
+    # Part headings without an ID, nested chapters, trailing text
+    "# BTC101\n\n## Part one\n\nPreamble\n\n## First chapter\n\n<chapterId>a1</chapterId>\n\n"
+    "Body of the first chapter.\n### Sub heading\nMore body.\n"
+    "## Second chapter\n<chapterId> b2 </chapterId>\nBody two.\n",
+    # ID line too far from the heading (sixth line) is ignored
+    "## Far\n1\n2\n3\n4\n5\n<chapterId>far</chapterId>\nBody\n",
+    # ID on the fifth line is still picked up
+    "## Near\n1\n2\n3\n4\n<chapterId>near</chapterId>\nBody\n",
+    # A heading inside another heading's window can still start its own chapter
+    "## Outer\n## Inner\n<chapterId>shared</chapterId>\nBody\n## Last\n<chapterId>last</chapterId>",
+    # Empty IDs are skipped, and only the first ID line after a heading counts
+    "## Empty\n<chapterId> </chapterId>\n<chapterId>second</chapterId>\nBody\n",
+    # Inline markup around the ID
+    "## Inline\nText <chapterId>inline</chapterId> text\nBody\n##NotAHeading\nStill body\n",
+]
+
+
+@pytest.mark.parametrize('content', CHAPTER_DOCUMENTS)
+def test_parse_chapters_matches_line_loop(content):
+    assert _regex_chapters(content) == _line_loop_chapters(content)
+
+
+def test_parse_chapters_spans():
+    content = "## One\n<chapterId>one</chapterId>\nBody one\n## Two\n<chapterId>two</chapterId>\nBody two"
+    assert _parse_chapters(content) == [
+        ('One', 'one', content.index('<chapterId>one'), content.index('## Two')),
+        ('Two', 'two', content.index('<chapterId>two'), len(content)),
+    ]
+
+
+def _reference_distribution(question_count, easy, intermediate, hard):
+    """Largest remainder over the decimal proportions, computed with exact fractions"""
+    proportions = [Fraction(str(p)) for p in (easy, intermediate, hard)]
+    total = sum(proportions)
+    if not total:
+        proportions, total = [1, 1, 1], 3
+    shares = [question_count * p / total for p in proportions]
+    counts = [int(share) for share in shares]
+    order = sorted(range(3), key=lambda i: counts[i] - shares[i])
+    for i in order[:question_count - sum(counts)]:
+        counts[i] += 1
+    if question_count >= 3:
+        for i in range(3):
+            if counts[i] == 0:
+                counts[max(range(3), key=counts.__getitem__)] -= 1
+                counts[i] = 1
+    return counts
+
+
+@pytest.mark.parametrize('question_count, proportions, expected', [
+    (0, (0.3, 0.5, 0.2), (0, 0, 0)),
+    (1, (0.3, 0.5, 0.2), (0, 1, 0)),
+    (2, (0.3, 0.5, 0.2), (1, 1, 0)),
+    (3, (0.3, 0.5, 0.2), (1, 1, 1)),
+    (10, (0.3, 0.5, 0.2), (3, 5, 2)),
+    (15, (0.3, 0.5, 0.2), (5, 7, 3)),
+    (5, (1, 0, 0), (3, 1, 1)),
+    (5, (0.7, 0.3, 0), (3, 1, 1)),
+    (4, (0, 0, 0), (2, 1, 1)),
+])
+def test_difficulty_distribution_counts(question_count, proportions, expected):
+    difficulties = _difficulty_distribution(question_count, *proportions)
+    counts = Counter(difficulties)
+    assert (counts['easy'], counts['intermediate'], counts['hard']) == expected
+    # Levels come grouped in easy -> hard order
+    assert list(difficulties) == sorted(difficulties, key=['easy', 'intermediate', 'hard'].index)
+
+
+@pytest.mark.parametrize('proportions', [(0.3, 0.5, 0.2), (0.2, 0.2, 0.6), (1, 1, 1), (0.7, 0.3, 0), (0, 0, 0)])
+def test_difficulty_distribution_is_largest_remainder(proportions):
+    for question_count in range(0, 40):
+        counts = Counter(_difficulty_distribution(question_count, *proportions))
+        assert sum(counts.values()) == question_count
+        assert [counts['easy'], counts['intermediate'], counts['hard']] == \
+            _reference_distribution(question_count, *proportions)
+
+
+class FakeBatches:
+    """Message Batches endpoint answering every request, results in reverse order"""
+
+    def __init__(self, statuses=('in_progress', 'ended')):
+        self.statuses = list(statuses)
+        self.requests = None
+        self.cancelled = []
+
+    def create(self, requests):
+        self.requests = requests
+        return SimpleNamespace(id='batch-1')
+
+    def retrieve(self, batch_id):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        done = len(self.requests) if status == 'ended' else len(self.requests) // 2
+        counts = SimpleNamespace(succeeded=done, errored=0, canceled=0, expired=0)
+        return SimpleNamespace(id=batch_id, processing_status=status, request_counts=counts)
+
+    def results(self, batch_id):
+        for request in reversed(self.requests):
+            custom_id = request['custom_id']
+            if custom_id == '1':
+                yield SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type='errored'))
+                continue
+            text = json.dumps({
+                'question': f'Question {custom_id}?',
+                'answer': 'Right',
+                'wrong_answers': ['Wrong 1', 'Wrong 2', 'Wrong 3'],
+                'explanation': 'Because.'
+            })
+            message = SimpleNamespace(content=[SimpleNamespace(text=text)])
+            yield SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type='succeeded', message=message))
+
+    def cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+
+
+class FakeClient:
+    def __init__(self, batches):
+        self.messages = SimpleNamespace(batches=batches)
+
+    def with_options(self, **options):
+        return self
+
+
+@pytest.fixture
+def course_repo(tmp_path, monkeypatch):
+    course = tmp_path / 'courses' / 'btc101'
+    course.mkdir(parents=True)
+    (course / 'course.yml').write_text('title: BTC\n')
+    (course / 'en.md').write_text(''.join(
+        f"## Chapter {i}\n<chapterId>id-{i}</chapterId>\n{'lorem ipsum ' * 20}\n" for i in range(3)
+    ))
+    monkeypatch.setenv('BEC_REPO', str(tmp_path))
+    return course
+
+
+@pytest.fixture
+def fake_batches(monkeypatch):
+    batches = FakeBatches()
+    monkeypatch.setattr(quiz_generator, '_shared_client', lambda api_key: FakeClient(batches))
+    monkeypatch.setattr(quiz_generator.time, 'sleep', lambda seconds: None)
+    return batches
+
+
+def test_generate_quiz_with_batch_api(course_repo, fake_batches):
+    events = list(QuizWorkflowManager().generate_quiz(
+        'BEC_REPO', 'btc101', ['id-0', 'id-1', 'id-2'], question_count=2, use_batch_api=True
+    ))
+
+    assert len(fake_batches.requests) == 6
+    assert fake_batches.cancelled == []
+
+    percentages = [event.percentage for event in events]
+    assert percentages == sorted(percentages)
+    assert events[-1].status == 'success'
+    assert events[-1].data['questions_generated'] == 5
+
+    saved = [event.data['saved_to'] for event in events if event.data and 'saved_to' in event.data]
+    assert len(saved) == 5
+    assert sorted(path.name for path in (course_repo / 'quizz').iterdir()) == sorted(saved)
+    # Each saved question keeps the chapter of the request it answered
+    for event in events:
+        if event.data and 'saved_to' in event.data:
+            question_yml = (course_repo / 'quizz' / event.data['saved_to'] / 'question.yml').read_text()
+            assert 'chapterId: id-' in question_yml
+
+
+def test_batch_is_cancelled_when_consumer_stops(course_repo, fake_batches):
+    fake_batches.statuses = ['in_progress']
+    events = QuizWorkflowManager().generate_quiz(
+        'BEC_REPO', 'btc101', ['id-0'], question_count=2, use_batch_api=True
+    )
+    for event in events:
+        if event.data and 'batch_id' in event.data:
+            next(events)
+            break
+    events.close()
+
+    assert fake_batches.cancelled == ['batch-1']
+
+
+class FakeMessages:
+    """Messages endpoint answering each call with a new question, or raising what fail(call) returns"""
+
+    def __init__(self, fail=lambda call: None):
+        self.fail = fail
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def create(self, **params):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        error = self.fail(call)
+        if error:
+            raise error
+        text = json.dumps({
+            'question': f'Question {call}?',
+            'answer': 'Right',
+            'wrong_answers': ['Wrong 1', 'Wrong 2', 'Wrong 3'],
+            'explanation': 'Because.'
+        })
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+def _api_error(error_class):
+    # Built without an HTTP response, which the real exception types expect
+    error = error_class.__new__(error_class)
+    Exception.__init__(error, error_class.__name__)
+    return error
+
+
+@pytest.fixture
+def fake_messages(monkeypatch):
+    def install(fail=lambda call: None):
+        messages = FakeMessages(fail)
+        client = FakeClient(None)
+        client.messages = messages
+        monkeypatch.setattr(quiz_generator, '_shared_client', lambda api_key: client)
+        # Raise API errors straight away instead of retrying through the rate limiter
+        monkeypatch.setattr(quiz_generator.QuizGenerator, 'CLAUDE_MAX_RETRIES', 0)
+        return messages
+    return install
+
+
+def test_generate_quiz_threaded(course_repo, fake_messages):
+    messages = fake_messages(lambda call: _api_error(anthropic.RateLimitError) if call % 5 == 0 else None)
+
+    events = list(QuizWorkflowManager().generate_quiz('BEC_REPO', 'btc101', ['id-0', 'id-1', 'id-2'], question_count=4))
+
+    assert messages.calls == 12
+    assert events[-1].status == 'success'
+    assert events[-1].data['questions_generated'] == 10
+    assert sum('Rate limited' in event.message for event in events) == 2
+
+    percentages = [event.percentage for event in events]
+    assert percentages == sorted(percentages)
+
+    # Folder numbers are handed out once across all chapters
+    saved = events[-1].data['saved_folders']
+    assert sorted(saved) == [f'{n:03d}' for n in range(1, 11)]
+    assert sorted(path.name for path in (course_repo / 'quizz').iterdir()) == sorted(saved)
+    chapters = Counter(
+        (course_repo / 'quizz' / folder / 'question.yml').read_text().split('chapterId: ')[1].split('\n')[0]
+        for folder in saved
+    )
+    assert sum(chapters.values()) == 10 and set(chapters) == {'id-0', 'id-1', 'id-2'}
+
+
+def test_fatal_api_error_cancels_remaining_questions(course_repo, fake_messages):
+    messages = fake_messages(lambda call: _api_error(anthropic.AuthenticationError))
+
+    events = list(QuizWorkflowManager().generate_quiz('BEC_REPO', 'btc101', ['id-0', 'id-1'], question_count=6))
+
+    # Each chapter sends at most its first wave of three before the run is cancelled
+    assert 1 <= messages.calls <= 2 * QuizWorkflowManager.MAX_PARALLEL_QUESTIONS_PER_CHAPTER
+    assert events[-1].status == 'error'
+    assert 'stopped' in events[-1].message
+    assert not any(path.is_dir() for path in (course_repo / 'quizz').iterdir())
+
+
+def test_failed_write_removes_reserved_folder(course_repo, fake_messages, monkeypatch):
+    fake_messages()
+    write_text_atomic = quiz_workflow._write_text_atomic
+    failed = []
+    lock = threading.Lock()
+
+    def write_once_failing(path, text):
+        with lock:
+            fail = path.endswith('en.yml') and not failed
+            if fail:
+                failed.append(path)
+        if fail:
+            raise OSError('disk full')
+        write_text_atomic(path, text)
+
+    monkeypatch.setattr(quiz_workflow, '_write_text_atomic', write_once_failing)
+
+    events = list(QuizWorkflowManager().generate_quiz('BEC_REPO', 'btc101', ['id-0', 'id-1'], question_count=3))
+
+    assert sum('Error saving question' in event.message for event in events) == 1
+    assert events[-1].data['questions_generated'] == 5
+    # The half-written folder is gone; every folder left on disk is a complete question
+    folders = sorted(path.name for path in (course_repo / 'quizz').iterdir())
+    assert folders == sorted(events[-1].data['saved_folders'])
+    for folder in folders:
+        assert sorted(path.name for path in (course_repo / 'quizz' / folder).iterdir()) == ['en.yml', 'question.yml']
+
+
+def test_reserve_skips_folders_created_elsewhere(course_repo):
+    manager = QuizWorkflowManager()
+    assert manager._reserve_quiz_folder('BEC_REPO', 'btc101')[0] == '001'
+
+    # Another process takes the next numbers after this run has cached its count
+    (course_repo / 'quizz' / '002').mkdir()
+    (course_repo / 'quizz' / '003').mkdir()
+    folder_num, question_dir = manager._reserve_quiz_folder('BEC_REPO', 'btc101')
+    assert folder_num == '004'
+    assert question_dir == str(course_repo / 'quizz' / '004')
+
+
+def test_concurrent_reservations_get_unique_folders(course_repo):
+    # Separate managers share no lock or number cache, like separate processes
+    managers = [QuizWorkflowManager() for _ in range(4)]
+    start = threading.Barrier(len(managers))
+    reserved = []
+
+    def reserve(manager):
+        start.wait()
+        for _ in range(3):
+            reserved.append(manager._reserve_quiz_folder('BEC_REPO', 'btc101')[0])
+
+    threads = [threading.Thread(target=reserve, args=(manager,)) for manager in managers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(reserved) == [f'{n:03d}' for n in range(1, 13)]
@@ -0,0 +1,216 @@
+"""Tests for transcript formatting, chunk seams and the transcript cache"""
+
+import re
+
+import pytest
+
+from course_components.transcription import (
+    TranscriptionResult,
+    TranscriptionService,
+    TranscriptSegment,
+)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    return TranscriptionService(max_file_size_mb=1)
+
+
+@pytest.fixture
+def large_audio(tmp_path):
+    """A file over the 1 MB limit of the service fixture, so it goes through chunking"""
+    audio = tmp_path / 'lecture.mp3'
+    audio.write_bytes(b'\0' * (2 * 1024 * 1024))
+    return audio
+
+
+def fake_chunks(monkeypatch, texts):
+    """Serve texts as the Whisper output of consecutive 10 second chunks; returns the call log"""
+    calls = []
+
+    def split(self, audio_file, temp_dir, progress_callback=None):
+        return ((temp_dir / f'chunk_{i:03d}.mp3', i * 10.0) for i in range(len(texts)))
+
+    def transcribe_single_file(self, audio_file, progress_callback=None, include_timestamps=False, time_offset=0.0):
+        calls.append(audio_file.name)
+        text = texts[int(audio_file.stem.split('_')[1])]
+        if not include_timestamps:
+            return text
+        words = text.split()
+        segments = [TranscriptSegment(time_offset + i, time_offset + i + 1, word) for i, word in enumerate(words)]
+        return text, segments
+
+    monkeypatch.setattr(TranscriptionService, '_split_audio_into_chunks', split)
+    monkeypatch.setattr(TranscriptionService, '_transcribe_single_file', transcribe_single_file)
+    return calls
+
+
+def _reference_format(transcript):
+    """The original re.split based formatter, kept as the reference for _format_transcript"""
+    if not transcript or not transcript.strip():
+        return transcript
+    text = transcript.strip()
+    parts = re.split(r'([.!?]+)\s+(?=[A-Z])', text)
+    sentences = []
+    i = 0
+    while i < len(parts):
+        if i + 1 < len(parts) and re.match(r'^[.!?]+$', parts[i + 1]):
+            sentence = parts[i] + parts[i + 1]
+            i += 2
+        else:
+            sentence = parts[i]
+            i += 1
+        sentence = sentence.strip()
+        if sentence:
+            sentences.append(sentence)
+    if len(sentences) <= 1:
+        if '. ' in text:
+            parts = text.split('. ')
+            sentences = []
+            for i, part in enumerate(parts):
+                part = part.strip()
+                if part:
+                    if i < len(parts) - 1 and not part.endswith(('.', '!', '?')):
+                        part += '.'
+                    sentences.append(part)
+        else:
+            sentences = [text]
+    cleaned = [sentence.strip() for sentence in sentences if len(sentence.strip()) > 1]
+    return '\n'.join(cleaned) if cleaned else text
+
+
+TRANSCRIPTS = [
+    "",
+    "   ",
+    "Hello",
+    "Hello world.",
+    "First sentence. Second sentence! Third one? Yes.",
+    "Wait... What?! Really. ok then",
+    "lower case after period. still lower. Upper Case now",
+    "e.g. this is an example. and more text. End",
+    "A. B. C. D.",
+    "One sentence.  Two   spaces before this One.\nNew line here. Fin",
+    "Price is 3.5 BTC. That is a lot! Right?",
+]
+
+
+@pytest.mark.parametrize('transcript', TRANSCRIPTS)
+def test_format_transcript_matches_reference(service, transcript):
+    assert service._format_transcript(transcript) == _reference_format(transcript)
+
+
+def test_chunked_transcript_is_formatted_as_one_text(service, large_audio, monkeypatch):
+    # The chunk boundaries cut sentences in half
+    texts = ["Bitcoin is a network. Blocks are", "found every ten minutes. Miners compete", "for fees! Done."]
+    fake_chunks(monkeypatch, texts)
+
+    assert service.transcribe(large_audio) == service._format_transcript(" ".join(texts))
+
+
+@pytest.mark.parametrize('previous_text, text, expected', [
+    ("", "anything at all", 0),
+    ("the quick brown fox jumps over the lazy dog", "the lazy dog sat down", 3),
+    # Case and punctuation are ignored
+    ("It is Done.", "is done, and more", 2),
+    # A word cut at the start of this chunk
+    ("we will talk about bitcoin mining today", "ut bitcoin mining today we start", 4),
+    # A word cut at the end of the previous chunk
+    ("we will talk about bitcoin mining to", "about bitcoin mining today we start", 3),
+    ("hello world", "completely different words", 0),
+    # A two-word run only counts at the very start
+    ("one two three four", "five three four more", 0),
+    # The run must close the previous chunk
+    ("alpha beta gamma delta epsilon zeta eta", "alpha beta gamma and more", 0),
+])
+def test_overlap_word_count(service, previous_text, text, expected):
+    assert service._overlap_word_count(previous_text, text) == expected
+
+
+def test_drop_leading_words(service):
+    assert service._drop_leading_words("a b  c d", 2) == "c d"
+    assert service._drop_leading_words("a b", 2) == ""
+    assert service._drop_leading_words("a b", 5) == ""
+
+
+def test_drop_leading_segment_words(service):
+    segments = [TranscriptSegment(0.0, 1.0, "a b"), TranscriptSegment(1.0, 2.0, "c d e"), TranscriptSegment(2.0, 3.0, "f")]
+    trimmed = service._drop_leading_segment_words(segments, 3)
+    assert [(s.start, s.end, s.text) for s in trimmed] == [(1.0, 2.0, "d e"), (2.0, 3.0, "f")]
+    assert service._drop_leading_segment_words(segments, 0) == segments
+
+
+def test_chunk_seams_are_deduplicated(service, large_audio, monkeypatch):
+    fake_chunks(monkeypatch, [
+        "Miners collect fees from the",
+        "fees from the transactions they include.",
+        "they include. Blocks follow.",
+    ])
+
+    assert service.transcribe(large_audio).split() == \
+        "Miners collect fees from the transactions they include. Blocks follow.".split()
+
+    result = service.transcribe(large_audio, include_timestamps=True)
+    words = [word for segment in result.segments for word in segment.text.split()]
+    assert words == "Miners collect fees from the transactions they include. Blocks follow.".split()
+    # Kept words keep the timestamps of the chunk they were taken from
+    assert (result.segments[-1].start, result.segments[-1].end) == (22.0, 24.0)
+
+
+@pytest.fixture
+def cached_service(monkeypatch, tmp_path):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    return TranscriptionService(max_file_size_mb=1, cache_dir=tmp_path / 'cache')
+
+
+def test_cache_serves_repeated_transcriptions(cached_service, large_audio, monkeypatch):
+    calls = fake_chunks(monkeypatch, ["First chunk.", "Second chunk."])
+
+    text = cached_service.transcribe(large_audio)
+    assert cached_service.transcribe(large_audio) == text
+    assert len(calls) == 2
+
+    result = cached_service.transcribe(large_audio, include_timestamps=True)
+    cached = cached_service.transcribe(large_audio, include_timestamps=True)
+    assert isinstance(cached, TranscriptionResult)
+    assert cached == result
+    assert len(calls) == 4
+
+    # One entry per output format, and no temp files left behind
+    assert sorted(path.suffix for path in cached_service.cache_dir.iterdir()) == ['.json', '.txt']
+
+
+def test_cache_key_follows_content_and_settings(cached_service, large_audio, monkeypatch):
+    key = cached_service._cache_file(large_audio, include_timestamps=False)
+    assert cached_service._cache_file(large_audio, include_timestamps=False) == key
+    assert cached_service._cache_file(large_audio, include_timestamps=True).stem == key.stem
+
+    cached_service.align_to_silence = True
+    assert cached_service._cache_file(large_audio, include_timestamps=False) != key
+    cached_service.align_to_silence = False
+
+    for setting, value in [('CACHE_FORMAT_VERSION', TranscriptionService.CACHE_FORMAT_VERSION + 1),
+                           ('OVERLAP_SECONDS', 2.0), ('OVERLAP_WINDOW_WORDS', 20), ('MIN_CHUNK_SECONDS', 60)]:
+        with monkeypatch.context() as patch:
+            patch.setattr(cached_service, setting, value)
+            assert cached_service._cache_file(large_audio, include_timestamps=False) != key, setting
+
+    large_audio.write_bytes(b'\1' * (2 * 1024 * 1024))
+    assert cached_service._cache_file(large_audio, include_timestamps=False) != key
+
+
+def test_unreadable_cache_entry_is_ignored(cached_service, large_audio, monkeypatch):
+    calls = fake_chunks(monkeypatch, ["Only chunk.", "Other chunk."])
+    cache_file = cached_service._cache_file(large_audio, include_timestamps=True)
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_text('{"text": "truncated', encoding='utf-8')
+
+    result = cached_service.transcribe(large_audio, include_timestamps=True)
+    assert result.text == "Only chunk.\nOther chunk."
+    assert len(calls) == 2
+    # The broken entry was replaced
+    assert cached_service._load_cached_transcript(cache_file, include_timestamps=True) == result
+
+
+def test_no_cache_without_cache_dir(service, large_audio):
+    assert service._cache_file(large_audio, include_timestamps=False) is None